@@ -0,0 +1,173 @@
+"""Compare accountability log queries before and after the composite indexes.
+
+Usage: python -m benchmarks.accountability_queries [rows] [users] [db_path]
+
+A synthetic accountability_logs table (1M rows by default) is built with the
+base schema only. The old date()-wrapped queries are timed against it, then
+_upgrade_database adds the indexes and the current store queries are timed
+on the same data. The query plan of each query is printed alongside.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+
+from utilities.accountability.database import AccountabilityStore
+
+REPEATS = 200
+DAYS = 365
+
+LEGACY_QUERIES = {
+    "tasks_for_day": (
+        "SELECT task, message_id, logged_time FROM accountability_logs "
+        "WHERE user_id = ? AND logged_date = ? ORDER BY logged_time ASC"
+    ),
+    "weekly_count": (
+        "SELECT COUNT(*) FROM accountability_logs "
+        "WHERE user_id = ? AND date(logged_date) >= date(?)"
+    ),
+    "weekly_logs": (
+        "SELECT task, logged_date, logged_time, reward FROM accountability_logs "
+        "WHERE user_id = ? AND date(logged_date) >= date(?) ORDER BY logged_time DESC"
+    ),
+    "history": (
+        "SELECT task, logged_date, logged_time, reward FROM accountability_logs "
+        "WHERE user_id = ? ORDER BY logged_time DESC LIMIT 10"
+    ),
+}
+
+
+def populate(store: AccountabilityStore, rows: int, users: int):
+    store._setup_tables()
+    today = datetime.now(timezone.utc).date()
+    now = int(datetime.now(timezone.utc).timestamp())
+    rng = random.Random(42)
+
+    def generate():
+        for _ in range(rows):
+            days_ago = rng.randrange(DAYS)
+            yield (
+                rng.randrange(1, users + 1),
+                "Synthetic benchmark task",
+                (today - timedelta(days=days_ago)).isoformat(),
+                str(now - days_ago * 86400 - rng.randrange(86400)),
+                rng.randrange(1, 20),
+            )
+
+    store.cursor.executemany(
+        "INSERT INTO accountability_logs (user_id, task, logged_date, logged_time, reward) VALUES (?, ?, ?, ?, ?)",
+        generate(),
+    )
+    store.conn.commit()
+
+
+def timed(func: Callable[[int], object], users: int) -> float:
+    rng = random.Random(7)
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        func(rng.randrange(1, users + 1))
+    return (time.perf_counter() - started) / REPEATS * 1000
+
+
+def plan(conn: sqlite3.Connection, sql: str, params: tuple) -> str:
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+
+def run_legacy(store: AccountabilityStore, users: int) -> dict:
+    today = datetime.now(timezone.utc).date()
+    start_of_week = today - timedelta(days=today.weekday())
+    params = {
+        "tasks_for_day": lambda user_id: (user_id, today.isoformat()),
+        "weekly_count": lambda user_id: (user_id, start_of_week.isoformat()),
+        "weekly_logs": lambda user_id: (user_id, start_of_week.isoformat()),
+        "history": lambda user_id: (user_id,),
+    }
+    results = {}
+    for name, sql in LEGACY_QUERIES.items():
+
+        def query(user_id, sql=sql, name=name):
+            return store.conn.execute(sql, params[name](user_id)).fetchall()
+
+        results[name] = (timed(query, users), plan(store.conn, sql, params[name](1)))
+    return results
+
+
+def run_current(store: AccountabilityStore, users: int) -> dict:
+    today = datetime.now(timezone.utc).date()
+    calls = {
+        "tasks_for_day": lambda user_id: store.get_tasks_for_day(user_id, today),
+        "weekly_count": store.get_weekly_tasks_count,
+        "weekly_logs": store.get_weekly_logs,
+        "history": store.get_user_history,
+    }
+    start_of_week = (today - timedelta(days=today.weekday())).isoformat()
+    plans = {
+        "tasks_for_day": (LEGACY_QUERIES["tasks_for_day"], (1, today.isoformat())),
+        "weekly_count": (
+            "SELECT COUNT(*) FROM accountability_logs WHERE user_id = ? AND logged_date >= ?",
+            (1, start_of_week),
+        ),
+        "weekly_logs": (
+            "SELECT task, logged_date, logged_time, reward FROM accountability_logs WHERE user_id = ? AND logged_date >= ? ORDER BY logged_time DESC",
+            (1, start_of_week),
+        ),
+        "history": (LEGACY_QUERIES["history"], (1,)),
+    }
+    return {
+        name: (timed(func, users), plan(store.conn, *plans[name]))
+        for name, func in calls.items()
+    }
+
+
+def main(argv: List[str]) -> int:
+    rows = int(argv[1]) if len(argv) > 1 else 1_000_000
+    users = int(argv[2]) if len(argv) > 2 else 2000
+    db_path = argv[3] if len(argv) > 3 else None
+
+    cleanup = db_path is None
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix="accountability-bench-", suffix=".db")
+        os.close(fd)
+    elif os.path.exists(db_path):
+        print(f"{db_path} already exists; pass a new path")
+        return 1
+
+    store = AccountabilityStore(db_path)
+    try:
+        started = time.perf_counter()
+        populate(store, rows, users)
+        print(
+            f"Populated {rows} rows for {users} users "
+            f"in {time.perf_counter() - started:.1f} s"
+        )
+
+        before = run_legacy(store, users)
+        started = time.perf_counter()
+        store._upgrade_database()
+        print(f"Built indexes in {time.perf_counter() - started:.1f} s\n")
+        after = run_current(store, users)
+
+        for name in LEGACY_QUERIES:
+            print(
+                f"{name:>14}: {before[name][0]:8.2f} ms -> {after[name][0]:6.2f} ms "
+                f"({before[name][0] / max(after[name][0], 1e-9):.0f}x)"
+            )
+            print(f"{'before':>14}: {before[name][1]}")
+            print(f"{'after':>14}: {after[name][1]}")
+    finally:
+        store.close()
+        if cleanup:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
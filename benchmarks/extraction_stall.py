@@ -0,0 +1,99 @@
+"""Measure event-loop stalls caused by link metadata extraction.
+
+Usage: python -m benchmarks.extraction_stall [corpus_dir] [workers]
+
+corpus_dir should contain saved .html pages; without one a synthetic corpus
+is generated. Each page is run through the extraction stage of analyze_link,
+first inline on the event loop and then through the process pool, while a
+ticker coroutine records how late the loop wakes it up.
+"""
+
+import asyncio
+import glob
+import os
+import sys
+import time
+from typing import List
+
+from utilities.links import classifier
+
+TICK_SECONDS = 0.005
+MAX_HTML_BYTES = 200000
+
+
+def load_corpus(corpus_dir: str | None) -> List[str]:
+    if corpus_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                pages.append(f.read(MAX_HTML_BYTES))
+        return pages
+
+    paragraph = "<p>" + "Async event loops should never block on parsing. " * 40
+    pages = []
+    for i in range(40):
+        body = "\n".join(f"{paragraph} {j}</p>" for j in range(60))
+        pages.append(
+            "<html><head>"
+            f"<title>Synthetic page {i}</title>"
+            f'<meta property="og:title" content="Synthetic page {i}">'
+            '<meta property="og:description" content="Benchmark corpus page">'
+            f"</head><body><article>{body}</article></body></html>"
+        )
+    return pages
+
+
+async def measure(pages: List[str], workers: int) -> dict:
+    classifier.configure_extract_executor(workers)
+    lags: List[float] = []
+    running = True
+
+    async def ticker():
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+    ticker_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            classifier._run_extraction(html, f"https://example.com/{i}")
+            for i, html in enumerate(pages)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    running = False
+    await ticker_task
+    classifier.shutdown_extract_executor()
+
+    return {
+        "elapsed": elapsed,
+        "max_stall": max(lags, default=0.0),
+        "total_stall": sum(lag for lag in lags if lag > TICK_SECONDS),
+        "ticks": len(lags),
+    }
+
+
+def main(argv: List[str]) -> int:
+    corpus_dir = argv[1] if len(argv) > 1 else None
+    workers = int(argv[2]) if len(argv) > 2 else 2
+    pages = load_corpus(corpus_dir)
+    if not pages:
+        print(f"No .html files found in {corpus_dir}")
+        return 1
+
+    print(f"Corpus: {len(pages)} pages, {sum(map(len, pages)) / 1024:.0f} KB")
+    for label, pool_workers in (("inline", 0), (f"pool({workers})", workers)):
+        result = asyncio.run(measure(pages, pool_workers))
+        print(
+            f"{label:>10}: wall {result['elapsed'] * 1000:8.1f} ms | "
+            f"max stall {result['max_stall'] * 1000:7.1f} ms | "
+            f"total stall {result['total_stall'] * 1000:8.1f} ms | "
+            f"ticks {result['ticks']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -145,18 +145,19 @@ async def on_slash_command_error(ctx, error):
         await ctx.respond(":x: An Error Occurred")
 
 
-try:
-    bot.load_extension("handlers.ai")
-    bot.load_extension("handlers.help")
-    bot.load_extension("handlers.links")
-    bot.load_extension("utilities.status")
-    bot.load_extension("handlers.reaction")
-    bot.load_extension("utilities.feedback")
-    bot.load_extension("handlers.link_embed")
-    bot.load_extension("utilities.links_sync")
-    bot.load_extension("utilities.accountability.accountability")
-except Exception as e:
-    print(f"Error Loading : {e}")
-    traceback.print_exc()
-
-bot.run(TOKEN)
+if __name__ == "__main__":
+    try:
+        bot.load_extension("handlers.ai")
+        bot.load_extension("handlers.help")
+        bot.load_extension("handlers.links")
+        bot.load_extension("utilities.status")
+        bot.load_extension("handlers.reaction")
+        bot.load_extension("utilities.feedback")
+        bot.load_extension("handlers.link_embed")
+        bot.load_extension("utilities.links_sync")
+        bot.load_extension("utilities.accountability.accountability")
+    except Exception as e:
+        print(f"Error Loading : {e}")
+        traceback.print_exc()
+
+    bot.run(TOKEN)
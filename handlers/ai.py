@@ -1,13 +1,13 @@
 import json
-import os
 import re
 from typing import Dict, List
 
 import discord
 from discord.ext import commands
-from openai import APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI
+from openai import APIConnectionError, APIStatusError, APITimeoutError
 
 from utilities.databases import TaskDatabase
+from utilities.llm import LLMClientRegistry, get_llm_registry
 from utilities.tasks import (
     LinearIntegration,
     TaskReviewView,
@@ -46,26 +46,12 @@ class AIHandlerCog(commands.Cog):
         self.db = TaskDatabase()
         self.linear = LinearIntegration()
 
-    def _build_ai_client(self) -> tuple[AsyncOpenAI, str, str]:
-        api_key = os.getenv("OPENROUTER_API_KEY")
-        if not api_key:
+    def _build_ai_client(self) -> tuple[LLMClientRegistry, str, str]:
+        registry = get_llm_registry()
+        if not registry.configured:
             raise ValueError("OPENROUTER_API_KEY not found in environment variables")
 
-        base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
-        model = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
-        headers = {}
-        referer = os.getenv("OPENROUTER_HTTP_REFERER")
-        if referer:
-            headers["HTTP-Referer"] = referer
-        title = os.getenv("OPENROUTER_APP_TITLE")
-        if title:
-            headers["X-Title"] = title
-
-        client_kwargs = {"api_key": api_key, "base_url": base_url}
-        if headers:
-            client_kwargs["default_headers"] = headers
-
-        return AsyncOpenAI(**client_kwargs), model, "OpenRouter"
+        return registry, registry.default_model, "OpenRouter"
 
     def _parse_task_list(self, content: str) -> List[Dict]:
         if not content:
@@ -203,7 +189,7 @@ class AIHandlerCog(commands.Cog):
         )
 
         try:
-            completion = await self.client.chat.completions.create(
+            completion = await self.client.complete(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_instruction},
@@ -1,22 +1,27 @@
 import asyncio
 import json
 import os
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 
-import aiohttp
 import discord
 from discord.ext import commands
 
-from utilities.databases import LinkDatabase
+from utilities.databases import LinkDatabase, SQLiteLinkDatabase
 from utilities.links import (
     LINK_CATEGORIES,
-    analyze_link,
+    LINK_LLM_BATCH_SIZE,
+    EnrichmentQueue,
+    LinkFetcher,
     domain_for_url,
+    enrich_links,
     extract_urls,
     is_media_url,
     normalize_url,
+    shutdown_extract_executor,
 )
+from utilities.links.backfill import BACKFILL_MODES, run_backfill
 
 PAGE_SIZE = 5
 ALLOWED_ROLE_ID = 1298971806593454080
@@ -25,6 +30,25 @@ DENIED_MESSAGE = "idk why i can't execute the command maybe ask <@72701287068388
 EXCLUDED_LINK_DOMAINS = ["instagram.com", "instagr.am"]
 LINKS_EMBED_URL = "https://novatra.spreadsheets600.buzz/"
 LINKS_JSON_PATH = "data/links.json"
+LINKS_BACKEND = os.getenv("LINKS_BACKEND", "json").lower()
+LINKS_DB_PATH = os.getenv("LINKS_DB_PATH", "data/links.db")
+LINKS_FLUSH_DELAY = float(os.getenv("LINKS_FLUSH_DELAY", "2"))
+LINKS_FLUSH_MAX_PENDING = int(os.getenv("LINKS_FLUSH_MAX_PENDING", "50"))
+LINK_ENRICH_WORKERS = int(os.getenv("LINK_ENRICH_WORKERS", "3"))
+LINK_ENRICH_QUEUE_SIZE = int(os.getenv("LINK_ENRICH_QUEUE_SIZE", "100"))
+
+
+def create_link_database() -> Union[LinkDatabase, SQLiteLinkDatabase]:
+    if LINKS_BACKEND == "sqlite":
+        db = SQLiteLinkDatabase(LINKS_DB_PATH)
+        if not db.count_links() and os.path.exists(LINKS_JSON_PATH):
+            db.import_json(LINKS_JSON_PATH)
+        return db
+    return LinkDatabase(
+        LINKS_JSON_PATH,
+        flush_delay=LINKS_FLUSH_DELAY,
+        max_pending=LINKS_FLUSH_MAX_PENDING,
+    )
 
 
 def _is_excluded_domain(domain: str) -> bool:
@@ -57,7 +81,7 @@ def has_allowed_role():
 class LinkResultsView(discord.ui.View):
     def __init__(
         self,
-        db: LinkDatabase,
+        db: Union[LinkDatabase, SQLiteLinkDatabase],
         query: Optional[str],
         user_id: Optional[int],
         category_id: Optional[int],
@@ -70,14 +94,11 @@ class LinkResultsView(discord.ui.View):
         self.category_id = category_id
         self.category = category
         self.page = 0
-        self.total = self.db.count_links(
-            query=self.query,
-            user_id=self.user_id,
-            category_id=self.category_id,
-            category=self.category,
-            exclude_domains=EXCLUDED_LINK_DOMAINS,
-        )
         self.page_size = PAGE_SIZE
+        self.cursors: List[Optional[tuple]] = [None]
+        self.entries: List[dict] = []
+        self.total = 0
+        self._load_page()
         self.message: Optional[discord.Message] = None
         self.add_item(
             discord.ui.Button(
@@ -88,14 +109,33 @@ class LinkResultsView(discord.ui.View):
         )
         self._sync_buttons()
 
+    def _load_page(self):
+        result = self.db.page_links(
+            query=self.query,
+            user_id=self.user_id,
+            category_id=self.category_id,
+            category=self.category,
+            exclude_domains=EXCLUDED_LINK_DOMAINS,
+            limit=self.page_size,
+            cursor=self.cursors[self.page],
+        )
+        if result["total"] is not None:
+            self.total = result["total"]
+        self.entries = result["links"]
+        del self.cursors[self.page + 1 :]
+        if result["next_cursor"] is not None:
+            self.cursors.append(result["next_cursor"])
+
     def _sync_buttons(self):
         total_pages = max(1, (self.total + self.page_size - 1) // self.page_size)
-        self.page = max(0, min(self.page, total_pages - 1))
         for item in self.children:
             if isinstance(item, discord.ui.Button) and item.custom_id == "links_prev":
                 item.disabled = self.page <= 0
             if isinstance(item, discord.ui.Button) and item.custom_id == "links_next":
-                item.disabled = self.page >= total_pages - 1
+                item.disabled = (
+                    self.page >= total_pages - 1
+                    or len(self.cursors) <= self.page + 1
+                )
 
     def _build_embed(self) -> discord.Embed:
         if self.total == 0:
@@ -107,15 +147,6 @@ class LinkResultsView(discord.ui.View):
             )
             return embed
 
-        entries = self.db.get_links(
-            query=self.query,
-            user_id=self.user_id,
-            category_id=self.category_id,
-            category=self.category,
-            exclude_domains=EXCLUDED_LINK_DOMAINS,
-            limit=self.page_size,
-            offset=self.page * self.page_size,
-        )
         embed = discord.Embed(
             title="Saved Links",
             color=0x2F3136,
@@ -126,7 +157,9 @@ class LinkResultsView(discord.ui.View):
             text=f"Page {self.page + 1}/{total_pages} • Total {self.total}"
         )
 
-        for idx, entry in enumerate(entries, start=self.page * self.page_size + 1):
+        for idx, entry in enumerate(
+            self.entries, start=self.page * self.page_size + 1
+        ):
             title = entry.get("title") or entry.get("site_name") or entry.get("domain")
             title = title or entry.get("url")
             title = title[:250] if title else "Untitled"
@@ -165,6 +198,7 @@ class LinkResultsView(discord.ui.View):
         return embed
 
     async def _update(self, interaction: discord.Interaction):
+        self._load_page()
         self._sync_buttons()
         embed = self._build_embed()
         await interaction.response.edit_message(embed=embed, view=self)
@@ -185,8 +219,7 @@ class LinkResultsView(discord.ui.View):
     async def next_button(
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
-        total_pages = max(1, (self.total + self.page_size - 1) // self.page_size)
-        if self.page < total_pages - 1:
+        if len(self.cursors) > self.page + 1:
             self.page += 1
         await self._update(interaction)
 
@@ -206,53 +239,27 @@ class LinkResultsView(discord.ui.View):
 class LinkSaverCog(commands.Cog):
     def __init__(self, bot: discord.Bot):
         self.bot = bot
-        self.db = LinkDatabase()
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._meta_semaphore = asyncio.Semaphore(3)
+        self.db = create_link_database()
+        self.fetcher = LinkFetcher(max_concurrency=3)
+        self.enrichment = EnrichmentQueue(
+            self._enrich_links,
+            workers=LINK_ENRICH_WORKERS,
+            max_size=LINK_ENRICH_QUEUE_SIZE,
+        )
+        self._recovered = False
+        self._backfill_running = False
 
     def cog_unload(self):
-        if self._session and not self._session.closed:
-            asyncio.create_task(self._session.close())
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session and not self._session.closed:
-            return self._session
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10),
-            headers={"User-Agent": "NovatraBot/1.0"},
-        )
-        return self._session
+        self.enrichment.stop()
+        self.db.close()
+        shutdown_extract_executor()
+        asyncio.create_task(self.fetcher.close())
 
     def _message_link(self, message: discord.Message) -> str:
         return f"https://discord.com/channels/{message.guild.id}/{message.channel.id}/{message.id}"
 
-    async def _fetch_and_store_metadata(self, link_id: int, url: str, domain: str):
-        html = None
-        async with self._meta_semaphore:
-            try:
-                session = await self._get_session()
-                async with session.get(url, allow_redirects=True) as resp:
-                    content_type = resp.headers.get("Content-Type", "")
-                    if "text/html" in content_type:
-                        raw = await resp.content.read(200000)
-                        html = raw.decode("utf-8", errors="ignore")
-            except Exception:
-                pass
-
-        metadata, category, context = await analyze_link(
-            url=url,
-            domain=domain,
-            html=html,
-        )
-        self.db.update_metadata(
-            link_id,
-            metadata.title,
-            metadata.description,
-            metadata.site_name,
-            metadata.image_url,
-            category,
-            context,
-        )
+    async def _enrich_links(self, links: List[Tuple[int, str, str]]):
+        await enrich_links(self.db, self.fetcher, links)
 
     def _prepare_links(self, message: discord.Message, urls: List[str]) -> List[dict]:
         prepared = []
@@ -294,12 +301,36 @@ class LinkSaverCog(commands.Cog):
 
         prepared = self._prepare_links(message, urls)
         saved = self.db.save_links(prepared)
-        for entry in saved:
-            domain = domain_for_url(entry["url"])
-            asyncio.create_task(
-                self._fetch_and_store_metadata(entry["id"], entry["url"], domain)
+        if saved:
+            await self.enrichment.enqueue_many(
+                [
+                    (entry["id"], entry["url"], domain_for_url(entry["url"]))
+                    for entry in saved
+                ]
+            )
+
+    async def _recover_pending_links(self):
+        pending = self.db.get_unenriched_links()
+        if pending:
+            print(f"[LinkEnrichment] Re-enqueueing {len(pending)} unenriched links")
+        jobs = [
+            (link["id"], link["url"], link.get("domain") or domain_for_url(link["url"]))
+            for link in pending
+            if not _is_excluded_url(link["url"])
+        ]
+        for start in range(0, len(jobs), LINK_LLM_BATCH_SIZE):
+            await self.enrichment.enqueue_many(
+                jobs[start : start + LINK_LLM_BATCH_SIZE]
             )
 
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if self._recovered:
+            return
+        self._recovered = True
+        self.enrichment.start()
+        asyncio.create_task(self._recover_pending_links())
+
     @commands.slash_command(
         name="links", description="View saved links from the link category"
     )
@@ -329,6 +360,69 @@ class LinkSaverCog(commands.Cog):
         message = await ctx.followup.send(embed=embed, view=view)
         view.message = message
 
+    @commands.slash_command(
+        name="links-backfill",
+        description="Re-fetch and re-classify stored links",
+    )
+    @commands.has_permissions(administrator=True)
+    async def links_backfill(
+        self,
+        ctx: discord.ApplicationContext,
+        mode: discord.Option(
+            str,
+            description="failed: only unclassified links, all: every link",
+            choices=BACKFILL_MODES,
+            required=False,
+            default="failed",
+        ) = "failed",
+        restart: discord.Option(
+            bool,
+            description="Ignore the checkpoint of an interrupted run",
+            required=False,
+            default=False,
+        ) = False,
+    ):
+        if self._backfill_running:
+            await ctx.respond("A backfill is already running.", ephemeral=True)
+            return
+
+        self._backfill_running = True
+        await ctx.defer()
+        message = await ctx.followup.send(f"Backfill ({mode}) started...")
+        last_edit = 0.0
+
+        async def edit_status(content: str):
+            try:
+                await message.edit(content=content)
+            except discord.HTTPException:
+                pass
+
+        async def report_progress(report):
+            nonlocal last_edit
+            if time.monotonic() - last_edit < 5:
+                return
+            last_edit = time.monotonic()
+            await edit_status(
+                f"Backfill ({mode}) up to #{report.last_id}: {report.summary()}"
+            )
+
+        try:
+            report = await run_backfill(
+                self.db,
+                self.fetcher,
+                mode=mode,
+                restart=restart,
+                on_progress=report_progress,
+            )
+        except Exception as e:
+            await edit_status(
+                f"Backfill ({mode}) stopped: {e}. Run it again to resume."
+            )
+            return
+        finally:
+            self._backfill_running = False
+        await edit_status(f"Backfill ({mode}) done: {report.summary()}")
+
 
 def setup(bot: discord.Bot):
     bot.add_cog(LinkSaverCog(bot))
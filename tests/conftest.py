@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from utilities.databases import LinkDatabase, SQLiteLinkDatabase
+
+
+def _link_payload(message_id, domain="example.com", url=None):
+    """A link as the message handler passes it to save_links()."""
+    return {
+        "url": url or f"https://{domain}/{message_id}",
+        "domain": domain,
+        "message_id": message_id,
+        "message_link": f"https://discord.com/channels/1/2/{message_id}",
+        "channel_id": 2,
+        "category_id": 3,
+        "author_id": 4,
+    }
+
+
+@pytest.fixture
+def make_payload():
+    return _link_payload
+
+
+@pytest.fixture
+def seed_links():
+    """Stored link records the db fixture starts from; override per module."""
+    return []
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def db(request, tmp_path, seed_links):
+    json_path = tmp_path / "links.json"
+    if seed_links:
+        next_id = max(link["id"] for link in seed_links) + 1
+        json_path.write_text(json.dumps({"links": seed_links, "next_id": next_id}))
+    if request.param == "json":
+        store = LinkDatabase(str(json_path), flush_delay=0)
+        yield store
+        store.close()
+    else:
+        store = SQLiteLinkDatabase(str(tmp_path / "links.db"))
+        if seed_links:
+            store.import_json(str(json_path))
+        yield store
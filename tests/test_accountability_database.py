@@ -0,0 +1,123 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from utilities.accountability import helpers as helpers_module
+from utilities.accountability.database import AccountabilityDB, AccountabilityStore
+from utilities.accountability.helpers import AccountabilityHelpers
+
+USER_ID = 42
+
+
+@pytest.fixture
+def helpers(monkeypatch):
+    monkeypatch.setenv("API_KEY", "")
+    monkeypatch.setattr(helpers_module.random, "uniform", lambda a, b: 1.0)
+    return AccountabilityHelpers()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AccountabilityStore(str(tmp_path / "accountability.db"))
+    store.setup()
+    yield store
+    store.close()
+
+
+def _log(store, helpers, task, day, logged_time=1):
+    return store.add_task(USER_ID, task, day, str(logged_time), helpers)
+
+
+def test_first_task_creates_the_user(store, helpers):
+    today = helpers.get_today()
+    result = _log(store, helpers, "Write the report", today)
+    reward = helpers.calculate_task_reward("Write the report", 1, 1)
+    assert result == {
+        "tasks": ["Write the report"],
+        "novacoins": 10 + reward,
+        "reward": reward,
+        "streak": 1,
+        "highest_streak": 1,
+        "weekly_count": 1,
+        "weekly_target": 5,
+        "new_user": True,
+    }
+    novacoins, streak, last_logged, highest, total, _ = store.get_user_stats(USER_ID)
+    assert (novacoins, streak, last_logged, highest, total) == (
+        10 + reward,
+        1,
+        today.isoformat(),
+        1,
+        1,
+    )
+
+
+def test_same_day_tasks_add_rewards_without_a_bonus(store, helpers):
+    today = helpers.get_today()
+    first = _log(store, helpers, "Task one", today, 1)
+    second = _log(store, helpers, "Task two", today, 2)
+    assert second["tasks"] == ["Task one", "Task two"]
+    assert second["streak"] == 1
+    assert not second["new_user"]
+    assert second["novacoins"] == first["novacoins"] + second["reward"]
+    assert second["weekly_count"] == 2
+
+
+def test_consecutive_days_extend_the_streak(store, helpers):
+    today = helpers.get_today()
+    first = _log(store, helpers, "Yesterday's task", today - timedelta(days=1))
+    result = _log(store, helpers, "Today's task", today)
+    assert result["streak"] == 2
+    assert result["highest_streak"] == 2
+    assert result["tasks"] == ["Today's task"]
+    assert result["novacoins"] == (
+        first["novacoins"] + helpers.calculate_novacoins_bonus(2) + result["reward"]
+    )
+
+
+def test_missed_day_resets_the_streak_but_keeps_the_best(store, helpers):
+    today = helpers.get_today()
+    for days_ago in (4, 3):
+        _log(store, helpers, "Old task", today - timedelta(days=days_ago))
+    result = _log(store, helpers, "Back again", today)
+    assert result["streak"] == 1
+    assert result["highest_streak"] == 2
+
+
+def test_failure_rolls_back_the_whole_log(store, helpers, monkeypatch):
+    today = helpers.get_today()
+    _log(store, helpers, "Task one", today)
+    before = store.get_user_stats(USER_ID)
+
+    def fail(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(helpers, "calculate_task_reward", fail)
+    with pytest.raises(RuntimeError):
+        _log(store, helpers, "Task two", today)
+    assert store.get_user_stats(USER_ID) == before
+    assert len(store.get_tasks_for_day(USER_ID, today)) == 1
+
+
+def test_concurrent_logs_are_serialized(tmp_path, helpers):
+    db = AccountabilityDB(str(tmp_path / "accountability.db"), readers=2)
+    today = helpers.get_today()
+
+    async def log_all():
+        return await asyncio.gather(
+            *(
+                db.add_task(USER_ID, f"Task {i}", today, str(i), helpers)
+                for i in range(20)
+            )
+        )
+
+    try:
+        results = asyncio.run(log_all())
+        stats = db.store.get_user_stats(USER_ID)
+    finally:
+        db.close()
+    assert sorted(len(result["tasks"]) for result in results) == list(range(1, 21))
+    assert sum(result["new_user"] for result in results) == 1
+    assert stats[0] == 10 + sum(result["reward"] for result in results)
+    assert stats[4] == 20
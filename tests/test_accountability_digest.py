@@ -0,0 +1,151 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from utilities.accountability import commands as commands_module
+from utilities.accountability.commands import AccountabilityCommands
+from utilities.accountability.database import AccountabilityDB
+
+USER_ID = 42
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+        self.edits = []
+        self.deleted = set()
+        self.edit_error = None
+
+    def get_partial_message(self, message_id):
+        channel = self
+
+        class PartialMessage:
+            async def edit(self, embed):
+                if channel.edit_error:
+                    raise channel.edit_error
+                if message_id in channel.deleted:
+                    raise discord.NotFound(
+                        SimpleNamespace(status=404, reason="Not Found"),
+                        "Unknown Message",
+                    )
+                channel.edits.append((message_id, embed))
+
+        return PartialMessage()
+
+    async def send(self, embed):
+        message = SimpleNamespace(id=1000 + len(self.sent))
+        self.sent.append((message.id, embed))
+        return message
+
+
+@pytest.fixture
+def digest(monkeypatch, tmp_path):
+    monkeypatch.setenv("API_KEY", "")
+    monkeypatch.setattr(commands_module, "DIGEST_DEBOUNCE_SECONDS", 0)
+    db = AccountabilityDB(str(tmp_path / "accountability.db"))
+    monkeypatch.setattr(commands_module, "AccountabilityDB", lambda: db)
+    cog = AccountabilityCommands(bot=None)
+    channel = FakeChannel()
+    cog.guild = SimpleNamespace(get_channel=lambda channel_id: channel)
+    cog.member = SimpleNamespace(id=USER_ID, display_name="Ada")
+    cog.today = cog.helpers.get_today()
+    cog.store = db.store
+    yield cog, channel
+    db.close()
+
+
+def _refresh(cog):
+    asyncio.run(cog._refresh_digest(cog.guild, cog.member, USER_ID, cog.today))
+
+
+def _log(cog, task):
+    cog.store.add_task(USER_ID, task, cog.today, "1", cog.helpers)
+
+
+def test_digest_is_posted_once_then_edited(digest):
+    cog, channel = digest
+    _log(cog, "First task")
+    _refresh(cog)
+    assert [message_id for message_id, _ in channel.sent] == [1000]
+    assert cog.store.get_digest_message_id(USER_ID, cog.today) == 1000
+
+    _log(cog, "Second task")
+    _refresh(cog)
+    assert len(channel.sent) == 1
+    message_id, embed = channel.edits[-1]
+    assert message_id == 1000
+    assert "Second task" in embed.description
+
+
+def test_deleted_digest_is_posted_again(digest):
+    cog, channel = digest
+    _log(cog, "First task")
+    _refresh(cog)
+    channel.deleted.add(1000)
+
+    _refresh(cog)
+    assert [message_id for message_id, _ in channel.sent] == [1000, 1001]
+    assert cog.store.get_digest_message_id(USER_ID, cog.today) == 1001
+
+
+def test_other_edit_errors_do_not_post_a_duplicate(digest):
+    cog, channel = digest
+    _log(cog, "First task")
+    _refresh(cog)
+    channel.edit_error = discord.HTTPException(
+        SimpleNamespace(status=500, reason="Server Error"), "oops"
+    )
+
+    _refresh(cog)
+    assert len(channel.sent) == 1
+    assert cog.store.get_digest_message_id(USER_ID, cog.today) == 1000
+
+
+def test_digest_from_before_the_digests_table_is_edited(digest):
+    cog, channel = digest
+    _log(cog, "First task")
+    cog.store.update_task_message_id(USER_ID, cog.today, 555)
+
+    _refresh(cog)
+    assert channel.sent == []
+    assert channel.edits[0][0] == 555
+
+
+def test_updates_within_the_window_are_folded(digest, monkeypatch):
+    cog, channel = digest
+    monkeypatch.setattr(commands_module, "DIGEST_DEBOUNCE_SECONDS", 0.05)
+    ctx = SimpleNamespace(guild=cog.guild, author=cog.member)
+
+    async def log_three():
+        for task in ("One", "Two", "Three"):
+            _log(cog, task)
+            await cog._update_accountability_channel(ctx, USER_ID, cog.today)
+        assert len(cog._digest_updates) == 1
+        await asyncio.gather(*cog._digest_updates)
+
+    asyncio.run(log_three())
+    assert len(channel.sent) == 1
+    assert channel.edits == []
+    assert "Three" in channel.sent[0][1].description
+    assert not cog._digest_updates and not cog._digest_pending
+
+
+def test_logs_on_either_side_of_midnight_refresh_both_days(digest, monkeypatch):
+    cog, channel = digest
+    monkeypatch.setattr(commands_module, "DIGEST_DEBOUNCE_SECONDS", 0.05)
+    ctx = SimpleNamespace(guild=cog.guild, author=cog.member)
+    yesterday = "2000-01-01"
+
+    async def log_both_days():
+        cog.store.add_task(USER_ID, "Late task", yesterday, "1", cog.helpers)
+        await cog._update_accountability_channel(ctx, USER_ID, yesterday)
+        _log(cog, "Early task")
+        await cog._update_accountability_channel(ctx, USER_ID, cog.today)
+        await asyncio.gather(*cog._digest_updates)
+
+    asyncio.run(log_both_days())
+    assert len(channel.sent) == 2
+    assert cog.store.get_digest_message_id(USER_ID, yesterday) is not None
+    assert cog.store.get_digest_message_id(USER_ID, cog.today) is not None
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.links import cache, classifier, enrichment, rules
+
+HTML = "<html><head><title>Raw title</title></head><body>Body</body></html>"
+
+
+def _reply(prompt):
+    if "several links" in prompt:
+        indexes = [int(i) for i in re.findall(r"^\[(\d+)\]", prompt, re.M)]
+        return {
+            "links": [
+                {
+                    "index": i,
+                    "title": f"Title {i}",
+                    "category": "video",
+                    "context": f"Batch {i}",
+                }
+                for i in indexes
+            ]
+        }
+    if "keys: category, context" in prompt:
+        return {"category": "video", "context": "Classified"}
+    if "keys: title, description, site_name, category, context" in prompt:
+        return {"title": "Analyzed", "category": "video", "context": "Analyzed"}
+    return {"title": "Metadata"}
+
+
+class FakeLLM:
+    def __init__(self, reply=_reply):
+        self.reply = reply
+        self.prompts = []
+
+    async def complete(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        content = self.reply(prompt)
+        if not isinstance(content, str):
+            content = json.dumps(content)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def llm(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        cache, "_link_cache", cache.LinkAnalysisCache(str(tmp_path / "cache.db"))
+    )
+    monkeypatch.setattr(rules, "_rule_classifier", rules.RuleClassifier())
+    monkeypatch.setattr(classifier, "_extract_workers", 0)
+    monkeypatch.setattr(classifier, "LINK_LLM_SINGLE_CALL", False)
+    monkeypatch.setattr(
+        classifier, "_batch_stats", {"batches": 0, "links": 0, "llm_calls_saved": 0}
+    )
+    client = FakeLLM()
+    monkeypatch.setattr(classifier, "_build_classifier_client", lambda: (client, "m"))
+    return client
+
+
+def _cached(url, namespace=None):
+    return asyncio.run(classifier.get_cached_analysis(url, namespace))
+
+
+def test_llm_classifies_when_no_rule_matches(llm):
+    url = "https://blog.example.com/post"
+    metadata, category, context = asyncio.run(
+        classifier.analyze_link(url, "blog.example.com", HTML)
+    )
+    assert (metadata.title, category, context) == ("Metadata", "video", "Classified")
+    assert len(llm.prompts) == 2
+    assert _cached(url)[1:] == ("video", "Classified")
+
+
+def test_rule_sets_category_and_keeps_context(llm):
+    url = "https://github.com/psf/black"
+    metadata, category, context = asyncio.run(
+        classifier.analyze_link(url, "github.com", HTML)
+    )
+    # One analysis call instead of metadata + classification
+    assert (metadata.title, category, context) == ("Analyzed", "code", "Analyzed")
+    assert len(llm.prompts) == 1
+    assert rules.get_rule_classifier().llm_calls_saved == 1
+    assert _cached(url)[1:] == ("code", "Analyzed")
+
+
+def test_rule_hit_without_context_is_not_cached(llm):
+    llm.reply = lambda prompt: "not json"
+    url = "https://github.com/psf/black"
+    metadata, category, context = asyncio.run(
+        classifier.analyze_link(url, "github.com", HTML)
+    )
+    assert (metadata.title, category, context) == ("Raw title", "code", None)
+    assert rules.get_rule_classifier().llm_calls_saved == 0
+    assert _cached(url) is None
+
+
+def test_classify_link_rule_keeps_context(llm):
+    url = "https://github.com/psf/black"
+    assert asyncio.run(classifier.classify_link(url, "github.com", title="Black")) == (
+        "code",
+        "Classified",
+    )
+    assert _cached(url, classifier.CLASSIFY_NAMESPACE)[1:] == ("code", "Classified")
+    assert _cached(url) is None
+
+
+def _links(*urls):
+    return [(url, url.split("/")[2], HTML) for url in urls]
+
+
+def test_batch_answers_links_in_one_call(llm):
+    links = _links(
+        "https://a.example.com/1",
+        "https://github.com/psf/black",
+        "https://b.example.com/2",
+    )
+    results = asyncio.run(classifier.analyze_links(links))
+    assert len(llm.prompts) == 1
+    assert [(meta.title, cat, ctx) for meta, cat, ctx in results] == [
+        ("Title 0", "video", "Batch 0"),
+        ("Title 1", "code", "Batch 1"),
+        ("Title 2", "video", "Batch 2"),
+    ]
+    # The per-link path needs two calls per link, or one for the rule hit
+    assert classifier.get_batch_stats() == {
+        "batches": 1,
+        "links": 3,
+        "llm_calls_saved": 4,
+    }
+    assert rules.get_rule_classifier().llm_calls_saved == 0
+    assert _cached("https://github.com/psf/black")[1:] == ("code", "Batch 1")
+
+
+def test_batch_is_split_into_chunks(llm, monkeypatch):
+    monkeypatch.setattr(classifier, "LINK_LLM_BATCH_SIZE", 2)
+    links = _links(*(f"https://site{i}.example.com/" for i in range(3)))
+    results = asyncio.run(classifier.analyze_links(links))
+    assert [ctx for _, _, ctx in results] == ["Batch 0", "Batch 1", "Batch 0"]
+    assert sum("several links" in prompt for prompt in llm.prompts) == 2
+    # The one-link chunk saved one call; the two-link chunk saved three
+    assert classifier.get_batch_stats()["llm_calls_saved"] == 4
+
+
+def test_unanswered_links_fall_back_to_single_analysis(llm):
+    def reply(prompt):
+        payload = _reply(prompt)
+        if "several links" in prompt:
+            payload["links"] = [e for e in payload["links"] if e["index"] != 1]
+        return payload
+
+    llm.reply = reply
+    links = _links("https://a.example.com/1", "https://b.example.com/2")
+    results = asyncio.run(classifier.analyze_links(links))
+    assert [ctx for _, _, ctx in results] == ["Batch 0", "Classified"]
+    assert len(llm.prompts) == 3
+    # Only the answered link counts; the fallback saved nothing
+    assert classifier.get_batch_stats()["llm_calls_saved"] == 1
+    assert classifier.get_batch_stats()["links"] == 1
+
+
+def test_batch_skips_cached_links(llm):
+    links = _links("https://a.example.com/1", "https://b.example.com/2")
+    asyncio.run(classifier.analyze_links(links[:1]))
+    llm.prompts.clear()
+    results = asyncio.run(classifier.analyze_links(links))
+    assert [ctx for _, _, ctx in results] == ["Classified", "Batch 0"]
+    assert len(llm.prompts) == 1
+    assert "https://a.example.com/1" not in "".join(llm.prompts)
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.need_text = {}
+
+    async def fetch(self, url, need_text=True):
+        self.need_text[url] = need_text
+        return HTML
+
+
+class FakeStore:
+    def update_metadata(self, link_id, *fields):
+        pass
+
+
+def test_rule_settled_links_skip_the_page_body(llm, monkeypatch):
+    monkeypatch.setattr(
+        enrichment, "get_llm_registry", lambda: SimpleNamespace(configured=True)
+    )
+    fetcher = FakeFetcher()
+    ruled, other = "https://github.com/psf/black", "https://blog.example.com/post"
+    jobs = [(1, ruled, "github.com"), (2, other, "blog.example.com")]
+
+    asyncio.run(enrichment.enrich_links(FakeStore(), fetcher, jobs))
+
+    assert fetcher.need_text == {ruled: False, other: True}
@@ -0,0 +1,77 @@
+import sqlite3
+
+from utilities.databases import LinkDatabase, SQLiteLinkDatabase
+
+
+def _counted(db):
+    """Stats recomputed from the rows, to compare with the running counters."""
+    stats = {"total": 0, "categories": {}, "domains": {}}
+    for link in db.get_all_links():
+        stats["total"] += 1
+        category = link.get("category") or "uncategorized"
+        domain = link.get("domain") or "unknown"
+        stats["categories"][category] = stats["categories"].get(category, 0) + 1
+        stats["domains"][domain] = stats["domains"].get(domain, 0) + 1
+    return stats
+
+
+def test_triggers_track_inserts_and_updates(tmp_path, make_payload):
+    db = SQLiteLinkDatabase(str(tmp_path / "links.db"))
+    saved = db.save_links(
+        [
+            make_payload(1, "github.com"),
+            make_payload(2, "github.com"),
+            make_payload(3, "a.io"),
+        ]
+    )
+    assert db.get_stats() == {
+        "total": 3,
+        "categories": {"uncategorized": 3},
+        "domains": {"github.com": 2, "a.io": 1},
+    }
+
+    db.update_metadata(saved[0]["id"], "T", None, None, None, "code")
+    db.update_metadata(saved[1]["id"], "T", None, None, None, "code")
+    db.update_metadata(saved[1]["id"], "T", None, None, None, "tool")
+    assert db.get_stats()["categories"] == {
+        "code": 1,
+        "tool": 1,
+        "uncategorized": 1,
+    }
+    assert db.get_stats() == _counted(db)
+
+
+def test_triggers_track_deletes(tmp_path, make_payload):
+    path = str(tmp_path / "links.db")
+    db = SQLiteLinkDatabase(path)
+    db.save_links([make_payload(1, "github.com"), make_payload(2, "a.io")])
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM links WHERE domain = 'a.io'")
+    assert db.get_stats() == {
+        "total": 1,
+        "categories": {"uncategorized": 1},
+        "domains": {"github.com": 1},
+    }
+
+
+def test_counts_are_backfilled_for_existing_databases(tmp_path, make_payload):
+    path = str(tmp_path / "links.db")
+    SQLiteLinkDatabase(path).save_links(
+        [make_payload(1, "github.com"), make_payload(2, "a.io")]
+    )
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP TABLE link_counts")
+        for name in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER link_counts_{name}")
+
+    db = SQLiteLinkDatabase(path)
+    assert db.get_stats() == _counted(db)
+    assert db.get_stats()["total"] == 2
+
+
+def test_json_store_stats_match_its_links(tmp_path, make_payload):
+    db = LinkDatabase(str(tmp_path / "links.json"), flush_delay=0)
+    saved = db.save_links([make_payload(1, "github.com"), make_payload(2, "a.io")])
+    db.update_metadata(saved[0]["id"], "T", None, None, None, "code")
+    assert db.get_stats() == _counted(db)
+    db.close()
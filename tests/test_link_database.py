@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import time
+
+from utilities.databases import LinkDatabase
+
+
+def _on_disk(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_writes_are_coalesced_until_flush(tmp_path, make_payload):
+    path = str(tmp_path / "links.json")
+    db = LinkDatabase(path, flush_delay=60, max_pending=100)
+    changes = []
+    db.add_change_listener(lambda: changes.append(True))
+
+    for message_id in range(1, 4):
+        db.save_links([make_payload(message_id)])
+
+    assert _on_disk(path)["links"] == []
+    assert db.count_links() == 3
+    assert not changes
+
+    db.flush()
+    data = _on_disk(path)
+    assert [link["id"] for link in data["links"]] == [1, 2, 3]
+    assert data["next_id"] == 4
+    assert len(changes) == 1
+
+    # Nothing pending, so a second flush neither writes nor notifies
+    db.flush()
+    assert len(changes) == 1
+    db.close()
+
+
+def test_timer_flushes_after_delay(tmp_path, make_payload):
+    path = str(tmp_path / "links.json")
+    db = LinkDatabase(path, flush_delay=0.05)
+    db.save_links([make_payload(1)])
+    assert _wait_for(lambda: len(_on_disk(path)["links"]) == 1)
+    db.close()
+
+
+def test_burst_reaching_max_pending_flushes_early(tmp_path, make_payload):
+    path = str(tmp_path / "links.json")
+    db = LinkDatabase(path, flush_delay=60, max_pending=5)
+    for message_id in range(1, 6):
+        db.save_links([make_payload(message_id)])
+    assert _wait_for(lambda: len(_on_disk(path)["links"]) == 5)
+    db.close()
+
+
+def test_unflushed_changes_win_over_file_on_disk(tmp_path, make_payload):
+    path = str(tmp_path / "links.json")
+    db = LinkDatabase(path, flush_delay=60)
+    db.save_links([make_payload(1)])
+    db.update_metadata(1, "Title", None, None, None, "article", "Context")
+    assert db.get_all_links()[0]["title"] == "Title"
+    db.close()
+    assert _on_disk(path)["links"][0]["context"] == "Context"
+
+
+def test_concurrent_saves_keep_every_link(tmp_path, make_payload):
+    path = str(tmp_path / "links.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"links": [], "next_id": 1}, f)
+    os.chmod(path, 0o664)
+    db = LinkDatabase(path, flush_delay=0.01, max_pending=7)
+
+    def worker(offset):
+        for message_id in range(offset, offset + 50):
+            db.save_links([make_payload(message_id)])
+            if message_id % 10 == 0:
+                db.flush()
+
+    threads = [
+        threading.Thread(target=worker, args=(i * 1000,)) for i in range(1, 5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    db.close()
+
+    data = _on_disk(path)
+    assert len(data["links"]) == 200
+    assert len({link["id"] for link in data["links"]}) == 200
+    assert data["next_id"] == 201
+    assert os.stat(path).st_mode & 0o777 == 0o664
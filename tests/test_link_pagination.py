@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+
+from utilities.databases import SQLiteLinkDatabase
+
+# Links 1, 3 and 5 predate created_at and sort after every dated link
+CREATED_AT = {
+    1: None,
+    2: "2024-01-02T10:00:00",
+    3: None,
+    4: "2024-01-02T10:00:00",
+    5: None,
+    6: "2024-01-03T09:00:00",
+}
+EXPECTED_ORDER = [6, 4, 2, 5, 3, 1]
+
+
+def _link(link_id, created_at):
+    link = {
+        "id": link_id,
+        "url": f"https://example.com/{link_id}",
+        "normalized_url": f"https://example.com/{link_id}",
+        "domain": "example.com",
+        "title": f"Page {link_id}",
+        "category": "article" if link_id % 2 else "code",
+        "message_id": link_id,
+        "message_link": f"https://discord.com/channels/1/2/{link_id}",
+        "channel_id": 2,
+        "category_id": 3,
+        "author_id": 4,
+    }
+    if created_at is not None:
+        link["created_at"] = created_at
+    return link
+
+
+@pytest.fixture
+def seed_links():
+    return [_link(i, created) for i, created in CREATED_AT.items()]
+
+
+def _walk(db, **filters):
+    ids, cursor, totals = [], None, set()
+    while True:
+        page = db.page_links(limit=2, cursor=cursor, **filters)
+        ids += [link["id"] for link in page["links"]]
+        totals.add(page["total"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, totals
+
+
+def test_pages_walk_every_link_once(db):
+    ids, totals = _walk(db)
+    assert ids == EXPECTED_ORDER
+    # Only the first page is counted
+    assert totals == {6, None}
+
+
+def test_pages_match_offset_listing(db):
+    assert [link["id"] for link in db.get_links(limit=10)] == EXPECTED_ORDER
+
+
+def test_pages_respect_filters(db):
+    ids, totals = _walk(db, category="article")
+    assert ids == [5, 3, 1]
+    assert totals == {3, None}
+
+
+def test_cursor_after_last_page_is_empty(db):
+    page = db.page_links(limit=6)
+    assert tuple(page["next_cursor"]) == ("", 1)
+    last = db.page_links(limit=1, cursor=("", 1))
+    assert last["links"] == []
+    assert last["total"] is None
+
+
+def test_sqlite_backfills_null_timestamps(tmp_path):
+    path = str(tmp_path / "links.db")
+    SQLiteLinkDatabase(path)
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO links (url, message_id, message_link, created_at) "
+            "VALUES ('https://example.com', 1, 'link', NULL)"
+        )
+    db = SQLiteLinkDatabase(path)
+    assert db.get_all_links()[0]["created_at"] == ""
+    assert [link["id"] for link in db.page_links()["links"]] == [1]
+
+
+def test_excluded_domains_cover_subdomains_and_ports(db):
+    if isinstance(db, SQLiteLinkDatabase):
+        with sqlite3.connect(db.db_path) as conn:
+            conn.executemany(
+                "UPDATE links SET domain = ? WHERE id = ?",
+                [("www.instagram.com", 2), ("instagram.com:443", 4), ("", 6)],
+            )
+        # Missing domains are filled in from the URL on startup
+        db = SQLiteLinkDatabase(db.db_path)
+    else:
+        links = {link["id"]: link for link in db._load_data()["links"]}
+        links[2]["domain"] = "www.instagram.com"
+        links[4]["domain"] = "instagram.com:443"
+        links[6]["domain"] = None
+    page = db.page_links(exclude_domains=["instagram.com", "not_a%domain"])
+    assert [link["id"] for link in page["links"]] == [6, 5, 3, 1]
+    assert db.count_links(exclude_domains=["example.com"]) == 2
@@ -0,0 +1,89 @@
+import pytest
+
+from utilities.databases import LinkDatabase
+from utilities.databases.link_search import LinkSearchIndex, build_fts_query
+
+LINKS = [
+    ("https://docs.python.org/3/library/asyncio.html", "Asyncio tutorial"),
+    ("https://github.com/psf/black", "Black code formatter"),
+    ("https://realpython.com/async-io-python", "Async IO in Python"),
+]
+
+
+@pytest.fixture
+def save(make_payload):
+    def save(db, links=LINKS):
+        saved = db.save_links(
+            [
+                make_payload(index, url.split("/")[2], url)
+                for index, (url, _) in enumerate(links, start=1)
+            ]
+        )
+        for entry, (_, title) in zip(saved, links):
+            db.update_metadata(entry["id"], title, None, None, None, "article")
+        return [entry["id"] for entry in saved]
+
+    return save
+
+
+def test_build_fts_query_quotes_prefix_terms():
+    assert build_fts_query("Async-IO async") == '"async"* "io"*'
+    assert build_fts_query("  --  ") is None
+
+
+def test_prefix_matches_partial_words(db, save):
+    ids = save(db)
+    found = {link["id"] for link in db.get_links(query="asyn")}
+    assert found == {ids[0], ids[2]}
+
+
+def test_every_term_must_match(db, save):
+    ids = save(db)
+    assert [link["id"] for link in db.get_links(query="asyn tutor")] == [ids[0]]
+    assert db.count_links(query="asyn black") == 0
+
+
+def test_title_outranks_url_match(db, save):
+    ids = save(
+        db,
+        [
+            ("https://example.com/formatter", "Unrelated page"),
+            ("https://example.org/tools", "Formatter guide"),
+        ],
+    )
+    assert db.get_links(query="formatter")[0]["id"] == ids[1]
+
+
+def test_search_sees_updated_metadata(db, save):
+    ids = save(db)
+    db.update_metadata(ids[1], "Ruff linter", None, None, None, "tool")
+    assert [link["id"] for link in db.get_links(query="ruff")] == [ids[1]]
+    assert db.count_links(query="black formatter") == 0
+
+
+def test_search_hits_go_through_other_filters(db, save):
+    ids = save(db)
+    db.update_metadata(ids[2], "Async IO in Python", None, None, None, "video")
+    found = db.get_links(query="asyn", category="article")
+    assert [link["id"] for link in found] == [ids[0]]
+    assert db.count_links(query="asyn", exclude_domains=["python.org"]) == 1
+
+
+def test_search_follows_reloaded_file(tmp_path, save):
+    path = str(tmp_path / "links.json")
+    reader = LinkDatabase(path, flush_delay=0)
+    assert reader.count_links(query="black") == 0
+    writer = LinkDatabase(path, flush_delay=0)
+    ids = save(writer)
+    writer.close()
+    assert [link["id"] for link in reader.get_links(query="black")] == [ids[1]]
+    reader.close()
+
+
+def test_index_drops_removed_tokens():
+    index = LinkSearchIndex()
+    index.add({"id": 1, "title": "Rust book"})
+    index.add({"id": 1, "title": "Go tour"})
+    assert index.search("rus") == {}
+    assert set(index.search("go")) == {1}
+    assert index.search("  ") is None
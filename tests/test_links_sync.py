@@ -0,0 +1,248 @@
+import asyncio
+import json
+import os
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from utilities import links_sync
+
+
+def _git(*args, cwd=None):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _write_links(path, months):
+    links = [
+        {
+            "id": link_id,
+            "url": f"https://example.com/{link_id}",
+            "title": f"Link {link_id}",
+            "created_at": f"{month}-01T00:00:00",
+        }
+        for link_id, month in enumerate(months, start=1)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"links": links, "next_id": len(links) + 1}, f)
+
+
+@pytest.fixture
+def cog(monkeypatch, tmp_path):
+    monkeypatch.setattr(links_sync.tasks.Loop, "start", lambda self, *a, **k: None)
+    monkeypatch.setattr(links_sync, "LINKS_JSON_PATH", str(tmp_path / "links.json"))
+    bot = SimpleNamespace(cogs={}, get_cog=lambda name: bot.cogs.get(name))
+    return links_sync.LinksSyncCog(bot)
+
+
+@pytest.fixture
+def origin(monkeypatch, tmp_path):
+    origin = tmp_path / "origin.git"
+    _git("init", "--bare", "-b", "main", str(origin))
+    for name, value in {
+        "LINKS_SYNC_MODE": "plumbing",
+        "GITHUB_CLONE_URL": str(origin),
+        "GITHUB_BRANCH": "main",
+        "GITHUB_BARE_DIR": str(tmp_path / "links.git"),
+        "GITHUB_SSH_DIR": str(tmp_path / "worktree"),
+        "LINKS_EXPORT_DIR": str(tmp_path / "export"),
+        "GITHUB_FILE_PATH": "links.json",
+        "GITHUB_EXPORT_DIR": "data",
+    }.items():
+        monkeypatch.setattr(links_sync, name, value)
+    return origin
+
+
+def _tree(origin):
+    return set(_git("ls-tree", "-r", "--name-only", "main", cwd=origin).split())
+
+
+def test_plumbing_sync_pushes_without_a_worktree(cog, origin, tmp_path):
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01", "2024-01"])
+    assert cog._git_push_sync() == (True, "Success")
+    assert _tree(origin) == {
+        "links.json",
+        "data/manifest.json",
+        "data/search-index.json",
+        "data/shards/2024-01.json",
+    }
+    assert not (tmp_path / "worktree").exists()
+    assert cog._git_push_sync() == (True, "No changes to push")
+
+
+def test_plumbing_sync_only_touches_changed_files(cog, origin):
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01"])
+    assert cog._git_push_sync()[0]
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01", "2024-02"])
+    assert cog._git_push_sync()[0]
+    changed = _git("diff", "--name-only", "main~1", "main", cwd=origin).split()
+    assert set(changed) == {
+        "links.json",
+        "data/manifest.json",
+        "data/search-index.json",
+        "data/shards/2024-02.json",
+    }
+    assert _git("rev-list", "--count", "main", cwd=origin) == "2"
+
+
+def test_plumbing_sync_restores_links_from_origin(cog, origin, monkeypatch, tmp_path):
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01"])
+    assert cog._git_push_sync()[0]
+
+    # A fresh host starts from the published links.json
+    fresh_path = tmp_path / "fresh" / "links.json"
+    monkeypatch.setattr(links_sync, "LINKS_JSON_PATH", str(fresh_path))
+    monkeypatch.setattr(links_sync, "GITHUB_BARE_DIR", str(tmp_path / "fresh.git"))
+    monkeypatch.setattr(links_sync, "LINKS_EXPORT_DIR", str(tmp_path / "fresh-out"))
+    fresh_path.parent.mkdir()
+    fresh_path.write_text("{}")
+    fresh = links_sync.LinksSyncCog(cog.bot)
+    assert fresh._git_push_sync() == (True, "No changes to push")
+    assert json.loads(fresh_path.read_text())["links"][0]["id"] == 1
+
+
+def test_failed_push_is_retried_with_a_new_commit(cog, origin, tmp_path):
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01"])
+    assert cog._git_push_sync()[0]
+    pushed = _git("rev-parse", "main", cwd=origin)
+
+    moved = tmp_path / "moved.git"
+    os.rename(origin, moved)
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01", "2024-01"])
+    ok, msg = cog._git_push_sync()
+    assert not ok and msg.startswith("git push failed")
+    bare = links_sync.GITHUB_BARE_DIR
+    assert _git("--git-dir", bare, "rev-parse", "refs/heads/main") == pushed
+
+    os.rename(moved, origin)
+    assert cog._git_push_sync() == (True, "Success")
+    assert _git("rev-parse", "main~1", cwd=origin) == pushed
+
+
+class FakeLinkStore:
+    def __init__(self):
+        self.listeners = []
+
+    def add_change_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        self.listeners.remove(callback)
+
+    def changed(self):
+        for callback in self.listeners:
+            callback()
+
+
+@pytest.fixture
+def debounced(cog, monkeypatch):
+    monkeypatch.setattr(links_sync, "LINKS_SYNC_QUIET_SECONDS", 60)
+    monkeypatch.setattr(links_sync, "LINKS_SYNC_MAX_DELAY", 600)
+    store = FakeLinkStore()
+    links_cog = SimpleNamespace(db=store, enrichment=SimpleNamespace(pending=0))
+    cog.bot.cogs["LinkSaverCog"] = links_cog
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01"])
+
+    cog.pushes = []
+    cog.push_result = (True, "Success")
+
+    async def push():
+        cog.pushes.append(links_sync.time.monotonic())
+        if cog.during_push:
+            cog.during_push()
+        return cog.push_result
+
+    cog.during_push = None
+    cog._git_push = push
+    cog._subscribe_to_links()
+    return cog, store, links_cog
+
+
+def _age(cog, seconds):
+    cog._first_change_at -= seconds
+    cog._last_change_at -= seconds
+
+
+def _edit_links(store, months):
+    _write_links(links_sync.LINKS_JSON_PATH, months)
+    store.changed()
+
+
+def test_sync_waits_for_a_quiet_window(debounced):
+    cog, store, _ = debounced
+    asyncio.run(cog._sync_once())
+    assert cog.pushes == []
+
+    _age(cog, 61)
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 1
+    assert cog._first_change_at is None and cog._last_change_at is None
+
+    # Nothing changed since, so later ticks stay idle
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 1
+
+
+def test_steady_changes_are_pushed_after_the_max_delay(debounced):
+    cog, store, _ = debounced
+    _age(cog, 61)
+    asyncio.run(cog._sync_once())
+    _edit_links(store, ["2024-01", "2024-02"])
+    cog._first_change_at -= 601
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 2
+
+
+def test_sync_waits_for_pending_enrichment(debounced):
+    cog, _, links_cog = debounced
+    links_cog.enrichment.pending = 2
+    _age(cog, 61)
+    assert not cog._sync_due()
+    cog._first_change_at -= 600
+    assert cog._sync_due()
+
+
+def test_missing_links_file_keeps_the_change_pending(debounced):
+    cog, _, _ = debounced
+    os.remove(links_sync.LINKS_JSON_PATH)
+    _age(cog, 61)
+    asyncio.run(cog._sync_once())
+    assert cog.pushes == []
+    assert cog._sync_due()
+
+    _write_links(links_sync.LINKS_JSON_PATH, ["2024-01"])
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 1
+
+
+def test_changes_during_a_push_stay_pending(debounced):
+    cog, store, _ = debounced
+    cog.during_push = lambda: _edit_links(store, ["2024-01", "2024-03"])
+    _age(cog, 61)
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 1
+    assert cog._last_change_at is not None
+    assert not cog._sync_due()
+
+    cog.during_push = None
+    _age(cog, 61)
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 2
+    assert cog._first_change_at is None
+
+
+def test_failed_push_waits_another_quiet_window(debounced):
+    cog, _, _ = debounced
+    cog.push_result = (False, "git push failed: offline")
+    cog._first_change_at -= 601
+    cog._last_change_at -= 61
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 1
+    assert not cog._sync_due()
+
+    cog.push_result = (True, "Success")
+    _age(cog, 61)
+    asyncio.run(cog._sync_once())
+    assert len(cog.pushes) == 2
@@ -1,5 +1,5 @@
 # Utilities package - organized into submodules:
-# - databases/: LinkDatabase, TaskDatabase
+# - databases/: LinkDatabase, SQLiteLinkDatabase, TaskDatabase
 # - links/: URL extraction, classification, metadata parsing
 # - tasks/: Task utilities, views, Linear integration
 # - accountability/: Accountability system
@@ -1,3 +1,5 @@
+import asyncio
+import os
 import random
 from datetime import datetime, timezone
 
@@ -6,6 +8,8 @@ import discord
 from .database import AccountabilityDB
 from .helpers import AccountabilityHelpers
 
+DIGEST_DEBOUNCE_SECONDS = float(os.getenv("ACCOUNTABILITY_DIGEST_DEBOUNCE", "3"))
+
 
 class AccountabilityCommands:
     def __init__(self, bot):
@@ -14,46 +18,101 @@ class AccountabilityCommands:
         self.helpers = AccountabilityHelpers()
         self.admin_ids = [727012870683885578]
         self.accountability_channel_id = 1340317410611429376
+        self._motivation_edits = set()
+        self._digest_updates = set()
+        self._digest_pending = set()
+        self._digest_locks = {}
+
+    async def _finish_motivation(self, message, embed, field_index, pending, suffix):
+        """Swap the fallback motivation for the LLM reply once it arrives."""
+        motivation_message = await pending
+        if not motivation_message:
+            return
+
+        field = embed.fields[field_index]
+        embed.set_field_at(
+            field_index,
+            name=field.name,
+            value=f"*{motivation_message}*" + suffix,
+            inline=field.inline,
+        )
+        try:
+            await message.edit(embed=embed)
+        except discord.HTTPException as e:
+            print(f"+ Error updating motivation: {type(e).__name__}: {e}")
 
     async def _update_accountability_channel(self, ctx, user_id, today):
-        """Update the accountability channel with the user's tasks."""
-        channel = ctx.guild.get_channel(self.accountability_channel_id)
+        """Schedule a refresh of the user's digest in the accountability channel.
+
+        Logs arriving within the debounce window are folded into one edit.
+        """
+        key = (user_id, today)
+        if key in self._digest_pending:
+            return
+
+        self._digest_pending.add(key)
+        update = asyncio.create_task(
+            self._refresh_digest(ctx.guild, ctx.author, user_id, today)
+        )
+        self._digest_updates.add(update)
+        update.add_done_callback(self._digest_updates.discard)
+
+    async def _refresh_digest(self, guild, member, user_id, today):
+        """Edit the user's digest for the day, posting a new one if it is gone."""
+        try:
+            await asyncio.sleep(DIGEST_DEBOUNCE_SECONDS)
+        finally:
+            # Anything logged from here on schedules its own refresh
+            self._digest_pending.discard((user_id, today))
+
+        channel = guild.get_channel(self.accountability_channel_id)
         if not channel:
             return
 
-        rows = self.db.get_tasks_for_day(user_id, today)
+        async with self._digest_locks.setdefault(user_id, asyncio.Lock()):
+            rows = await self.db.get_tasks_for_day(user_id, today)
 
-        tasks_today = []
-        message_ids = set()
-        latest_logged_time = self.helpers.get_current_timestamp()
+            tasks_today = []
+            latest_logged_time = self.helpers.get_current_timestamp()
 
-        for index, (task_entry, msg_id, log_time) in enumerate(rows, start=1):
-            tasks_today.append(f"**{index}.** {task_entry}")
-            if msg_id is not None:
-                message_ids.add(msg_id)
-            if log_time:
-                latest_logged_time = max(latest_logged_time, int(log_time))
+            for index, (task_entry, _, log_time) in enumerate(rows, start=1):
+                tasks_today.append(f"**{index}.** {task_entry}")
+                if log_time:
+                    latest_logged_time = max(latest_logged_time, int(log_time))
 
-        task_summary = "\n".join(tasks_today)
+            task_summary = "\n".join(tasks_today)
 
-        for message_id in message_ids:
-            try:
-                message = await channel.fetch_message(message_id)
-                await message.delete()
-            except (discord.NotFound, discord.Forbidden, Exception) as e:
-                print(f"+ Error with message {message_id}: {type(e).__name__}: {e}")
-
-        tasks_embed = discord.Embed(
-            title=f"📝 {ctx.author.display_name}'s Completed Tasks",
-            description=task_summary
-            or "No tasks logged yet today. Use `/log add [task]` to log your first task!",
-            color=0xAAB99A,
-        )
-        tasks_embed.add_field(name="Last Logged", value=f"<t:{latest_logged_time}:F>")
+            tasks_embed = discord.Embed(
+                title=f"📝 {member.display_name}'s Completed Tasks",
+                description=task_summary
+                or "No tasks logged yet today. Use `/log add [task]` to log your first task!",
+                color=0xAAB99A,
+            )
+            tasks_embed.add_field(
+                name="Last Logged", value=f"<t:{latest_logged_time}:F>"
+            )
 
-        message = await channel.send(embed=tasks_embed)
+            message_id = await self.db.get_digest_message_id(user_id, today)
+            if message_id:
+                try:
+                    await channel.get_partial_message(message_id).edit(
+                        embed=tasks_embed
+                    )
+                    return
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException as e:
+                    print(
+                        f"+ Error with message {message_id}: {type(e).__name__}: {e}"
+                    )
+                    return
 
-        self.db.update_task_message_id(user_id, today, message.id)
+            try:
+                message = await channel.send(embed=tasks_embed)
+            except discord.HTTPException as e:
+                print(f"+ Error sending digest: {type(e).__name__}: {e}")
+                return
+            await self.db.set_digest_message_id(user_id, today, message.id)
 
     async def add_command(self, ctx: discord.ApplicationContext, task: str):
         """Log a task for the user."""
@@ -64,65 +123,28 @@ class AccountabilityCommands:
         current_time = self.helpers.get_current_timestamp()
 
         try:
-            user_stats = self.db.get_user_stats(user_id)
-
-            if user_stats:
-                (
-                    novacoins,
-                    streak,
-                    last_logged,
-                    highest_streak,
-                    total_tasks,
-                    weekly_target,
-                ) = user_stats
-                last_logged = (
-                    datetime.strptime(last_logged, "%Y-%m-%d").date()
-                    if last_logged
-                    else None
-                )
-
-                if last_logged != today:
-                    streak_change = self.helpers.calculate_streak(last_logged, today)
-
-                    if streak_change:
-                        streak += 1
-
-                    else:
-                        streak = 1
-
-                    daily_bonus = self.helpers.calculate_novacoins_bonus(streak)
-                    novacoins += daily_bonus
-
-                    self.db.update_user_stats(
-                        user_id, novacoins, streak, today, highest_streak
-                    )
-            else:
-                novacoins, streak = 10, 1
-                highest_streak = 1
-                self.db.create_user(user_id, novacoins, streak, today)
-
-            tasks_today = self.db.get_tasks_for_day(user_id, today)
-            task_count = len(tasks_today) + 1
-
-            task_reward = self.helpers.calculate_task_reward(task, task_count, streak)
-            novacoins += task_reward
-
-            self.db.log_task(user_id, task, today, current_time, task_reward)
-            self.db.update_user_stats(user_id, novacoins, streak, today, highest_streak)
-
+            result = await self.db.add_task(
+                user_id, task, today, current_time, self.helpers
+            )
         except Exception as e:
             await ctx.respond(f"Error logging task: {str(e)}", ephemeral=True)
             return
 
-        tasks = self.db.get_tasks_for_day(user_id, today)
-        tasks_today = [row[0] for row in tasks]
+        tasks_today = result["tasks"]
+        novacoins = result["novacoins"]
+        task_reward = result["reward"]
+        streak = result["streak"]
+        highest_streak = result["highest_streak"]
 
-        motivation_message = self.helpers.generate_motivation(tasks_today)
+        (
+            motivation_message,
+            pending_motivation,
+        ) = await self.helpers.motivation_within_budget(tasks_today)
 
-        weekly_count = self.db.get_weekly_tasks_count(user_id)
         weekly_target_message = ""
-        if user_stats:
-            weekly_target = user_stats[5]
+        if not result["new_user"]:
+            weekly_count = result["weekly_count"]
+            weekly_target = result["weekly_target"]
             weekly_progress = min(weekly_count / weekly_target * 100, 100)
             weekly_target_message = f"\n📊 Weekly Progress: {weekly_count}/{weekly_target} tasks ({weekly_progress:.1f}%)"
 
@@ -143,13 +165,27 @@ class AccountabilityCommands:
             inline=True,
         )
 
+        motivation_index = len(response_msg.fields)
         response_msg.add_field(
             name="✨ Quick Motivation",
             value=f"*{motivation_message}*" + weekly_target_message,
             inline=False,
         )
 
-        await ctx.respond(embed=response_msg)
+        message = await ctx.respond(embed=response_msg)
+
+        if pending_motivation:
+            edit = asyncio.create_task(
+                self._finish_motivation(
+                    message,
+                    response_msg,
+                    motivation_index,
+                    pending_motivation,
+                    weekly_target_message,
+                )
+            )
+            self._motivation_edits.add(edit)
+            edit.add_done_callback(self._motivation_edits.discard)
 
         await self._update_accountability_channel(ctx, user_id, today)
 
@@ -160,7 +196,7 @@ class AccountabilityCommands:
         user_id = ctx.author.id
         today = self.helpers.get_today()
 
-        task_info = self.db.get_task_by_number(user_id, today, task_number)
+        task_info = await self.db.get_task_by_number(user_id, today, task_number)
         if not task_info:
             await ctx.respond(
                 "❌ Invalid task number or you have no logged tasks for today!"
@@ -169,9 +205,9 @@ class AccountabilityCommands:
 
         task_id, task_text, message_id = task_info
 
-        self.db.delete_task(task_id)
+        await self.db.delete_task(task_id)
 
-        user_stats = self.db.get_user_stats(user_id)
+        user_stats = await self.db.get_user_stats(user_id)
         if not user_stats:
             await ctx.respond("❌ Error: User stats not found!")
             return
@@ -181,7 +217,7 @@ class AccountabilityCommands:
         penalty = int(10 + 0.2 * streak)
         novacoins -= penalty
 
-        self.db.update_user_stats(user_id, novacoins, streak, today)
+        await self.db.update_user_stats(user_id, novacoins, streak, today)
 
         response_embed = discord.Embed(
             title="🗑️ Task Deleted",
@@ -207,12 +243,12 @@ class AccountabilityCommands:
         member = member or ctx.author
         user_id = member.id
 
-        user_stats = self.db.get_user_stats(user_id)
+        user_stats = await self.db.get_user_stats(user_id)
         if user_stats:
             novacoins, streak, _, highest_streak, total_tasks, weekly_target = (
                 user_stats
             )
-            weekly_count = self.db.get_weekly_tasks_count(user_id)
+            weekly_count = await self.db.get_weekly_tasks_count(user_id)
             weekly_progress = (
                 min(weekly_count / weekly_target * 100, 100) if weekly_target > 0 else 0
             )
@@ -276,7 +312,7 @@ class AccountabilityCommands:
         member = ctx.author
         user_id = member.id
 
-        history = self.db.get_user_history(user_id)
+        history = await self.db.get_user_history(user_id)
         if not history:
             await ctx.respond("📜 No Tasks Logged Yet!", ephemeral=True)
             return
@@ -304,8 +340,8 @@ class AccountabilityCommands:
         member = ctx.author
         user_id = member.id
 
-        weekly_logs = self.db.get_weekly_logs(user_id)
-        user_stats = self.db.get_user_stats(user_id)
+        weekly_logs = await self.db.get_weekly_logs(user_id)
+        user_stats = await self.db.get_user_stats(user_id)
         weekly_count = len(weekly_logs) if weekly_logs else 0
         total_coins_earned = sum(row[3] for row in weekly_logs) if weekly_logs else 0
 
@@ -367,8 +403,8 @@ class AccountabilityCommands:
         """Get the accountability leaderboard."""
         await ctx.defer()
 
-        leaderboard = self.db.get_leaderboard()
-        streak_leaderboard = self.db.get_leaderboard(by_streak=True)
+        leaderboard = await self.db.get_leaderboard()
+        streak_leaderboard = await self.db.get_leaderboard(by_streak=True)
 
         if not leaderboard and not streak_leaderboard:
             await ctx.respond("🏆 No One Has Logged Any Tasks Yet!", ephemeral=True)
@@ -430,7 +466,7 @@ class AccountabilityCommands:
         member = member or ctx.author
         user_id = member.id
 
-        self.db.reset_user(user_id)
+        await self.db.reset_user(user_id)
 
         embed = discord.Embed(
             title="🔄 Accountability Reset",
@@ -458,7 +494,7 @@ class AccountabilityCommands:
             return
 
         user_id = member.id
-        user_stats = self.db.get_user_stats(user_id)
+        user_stats = await self.db.get_user_stats(user_id)
 
         if user_stats:
             current_novacoins, current_streak, _ = user_stats
@@ -466,12 +502,12 @@ class AccountabilityCommands:
             new_streak = current_streak + streak
 
             today = self.helpers.get_today()
-            self.db.update_user_stats(user_id, new_novacoins, new_streak, today)
+            await self.db.update_user_stats(user_id, new_novacoins, new_streak, today)
         else:
             new_novacoins = novacoins
             new_streak = streak
             today = self.helpers.get_today()
-            self.db.create_user(user_id, new_novacoins, new_streak, today)
+            await self.db.create_user(user_id, new_novacoins, new_streak, today)
 
         embed = discord.Embed(
             title="💰 Currency Added",
@@ -510,7 +546,7 @@ class AccountabilityCommands:
             return
 
         user_id = member.id
-        user_stats = self.db.get_user_stats(user_id)
+        user_stats = await self.db.get_user_stats(user_id)
 
         if user_stats:
             current_novacoins, current_streak, _ = user_stats
@@ -518,12 +554,12 @@ class AccountabilityCommands:
             new_streak = current_streak - streak
 
             today = self.helpers.get_today()
-            self.db.update_user_stats(user_id, new_novacoins, new_streak, today)
+            await self.db.update_user_stats(user_id, new_novacoins, new_streak, today)
         else:
             new_novacoins = -novacoins
             new_streak = -streak
             today = self.helpers.get_today()
-            self.db.create_user(user_id, new_novacoins, new_streak, today)
+            await self.db.create_user(user_id, new_novacoins, new_streak, today)
 
         embed = discord.Embed(
             title="💰 Currency Removed",
@@ -557,7 +593,7 @@ class AccountabilityCommands:
             return
 
         user_id = ctx.author.id
-        self.db.update_weekly_target(user_id, target)
+        await self.db.update_weekly_target(user_id, target)
 
         embed = discord.Embed(
             title="🎯 Weekly Target Updated",
@@ -571,7 +607,7 @@ class AccountabilityCommands:
         """Display available items in the store."""
         await ctx.defer()
 
-        store_items = self.db.get_store_items()
+        store_items = await self.db.get_store_items()
         if not store_items:
             await ctx.respond(
                 "🏪 The store is currently empty. Check back later!", ephemeral=True
@@ -600,11 +636,7 @@ class AccountabilityCommands:
 
         user_id = ctx.author.id
 
-        self.db.cursor.execute(
-            "SELECT name, description, price FROM store_items WHERE id = ? AND is_active = 1",
-            (item_id,),
-        )
-        item = self.db.cursor.fetchone()
+        item = await self.db.get_store_item(item_id)
 
         if not item:
             await ctx.respond(
@@ -614,7 +646,7 @@ class AccountabilityCommands:
 
         name, description, price = item
 
-        user_stats = self.db.get_user_stats(user_id)
+        user_stats = await self.db.get_user_stats(user_id)
         if not user_stats or user_stats[0] < price:
             await ctx.respond(
                 f"❌ You don't have enough NovaCoins to buy this item. You need {price} coins.",
@@ -625,9 +657,9 @@ class AccountabilityCommands:
         novacoins = user_stats[0] - price
         today = self.helpers.get_today()
 
-        self.db.update_user_stats(user_id, novacoins, user_stats[1], today)
+        await self.db.update_user_stats(user_id, novacoins, user_stats[1], today)
 
-        self.db.purchase_item(user_id, item_id)
+        await self.db.purchase_item(user_id, item_id)
 
         purchase_embed = discord.Embed(
             title="🛒 Item Purchased",
@@ -662,7 +694,7 @@ class AccountabilityCommands:
         await ctx.defer()
 
         user_id = ctx.author.id
-        user_items = self.db.get_user_items(user_id)
+        user_items = await self.db.get_user_items(user_id)
 
         if not user_items:
             await ctx.respond(
@@ -712,7 +744,7 @@ class AccountabilityCommands:
         await ctx.defer()
 
         user_id = ctx.author.id
-        unused_items = self.db.get_user_items(user_id, unused_only=True)
+        unused_items = await self.db.get_user_items(user_id, unused_only=True)
 
         if not unused_items:
             await ctx.respond(
@@ -730,7 +762,7 @@ class AccountabilityCommands:
         selected_item = unused_items[item_number - 1]
         item_id, name, description, _ = selected_item
 
-        self.db.use_item(item_id)
+        await self.db.use_item(item_id)
 
         use_embed = discord.Embed(
             title="🎉 Item Used",
@@ -771,7 +803,7 @@ class AccountabilityCommands:
             )
             return
 
-        success = self.db.add_store_item(name, description, price)
+        success = await self.db.add_store_item(name, description, price)
 
         if success:
             item_embed = discord.Embed(
@@ -802,14 +834,14 @@ class AccountabilityCommands:
         """Handle member leaving the server."""
         user_id = member.id
         try:
-            self.db.reset_user(user_id)
+            await self.db.reset_user(user_id)
             print(f"Removed Data For User {user_id} Who Left The Server")
         except Exception as e:
             print(f"Error Removing Data For The User {user_id}: {str(e)}")
 
     async def cleanup_missing_users(self):
         """Clean up data for users who are no longer in any server."""
-        all_users = self.db.get_all_users()
+        all_users = await self.db.get_all_users()
         users_to_remove = []
 
         for user_id in all_users:
@@ -824,7 +856,7 @@ class AccountabilityCommands:
 
         for user_id in users_to_remove:
             try:
-                self.db.reset_user(user_id)
+                await self.db.reset_user(user_id)
                 print(
                     f"Cleaned Up Data For User {user_id} Who Is No Longer In Any Server"
                 )
@@ -846,7 +878,7 @@ class AccountabilityCommands:
             )
             return
 
-        self.db.set_reminder(user_id, time)
+        await self.db.set_reminder(user_id, time)
 
         hour, minute = map(int, time.split(":"))
         friendly_time = f"{hour if hour <= 12 else hour - 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
@@ -877,14 +909,14 @@ class AccountabilityCommands:
 
         user_id = ctx.author.id
 
-        reminder_time = self.db.get_user_reminder(user_id)
+        reminder_time = await self.db.get_user_reminder(user_id)
         if not reminder_time:
             await ctx.respond(
                 "⚠️ You don't have any active reminders to delete.", ephemeral=True
             )
             return
 
-        self.db.delete_reminder(user_id)
+        await self.db.delete_reminder(user_id)
 
         embed = discord.Embed(
             title="🔕 Reminder Deleted",
@@ -900,7 +932,7 @@ class AccountabilityCommands:
 
         user_id = ctx.author.id
 
-        reminder_time = self.db.get_user_reminder(user_id)
+        reminder_time = await self.db.get_user_reminder(user_id)
 
         if not reminder_time:
             await ctx.respond(
@@ -933,7 +965,7 @@ class AccountabilityCommands:
         current_hour = now.hour
         current_minute = now.minute
 
-        reminders = self.db.get_all_active_reminders(current_hour, current_minute)
+        reminders = await self.db.get_all_active_reminders(current_hour, current_minute)
 
         for user_id, reminder_time in reminders:
             try:
@@ -941,7 +973,7 @@ class AccountabilityCommands:
                 if not user:
                     continue
 
-                user_stats = self.db.get_user_stats(user_id)
+                user_stats = await self.db.get_user_stats(user_id)
                 streak = user_stats[1] if user_stats else 0
 
                 embed = discord.Embed(
@@ -1,11 +1,44 @@
+import asyncio
+import functools
+import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
-
-class AccountabilityDB:
-    def __init__(self):
-        self.conn = sqlite3.connect("data/accountability.db")
-        self.cursor = self.conn.cursor()
+ACCOUNTABILITY_DB_PATH = os.getenv("ACCOUNTABILITY_DB_PATH", "data/accountability.db")
+ACCOUNTABILITY_DB_READERS = int(os.getenv("ACCOUNTABILITY_DB_READERS", "2"))
+
+
+class AccountabilityStore:
+    """Blocking queries; every thread that uses the store gets its own connection."""
+
+    def __init__(self, db_path: str = ACCOUNTABILITY_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            # WAL lets the reader connections run while the writer commits
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        self.conn
+        return self._local.cursor
+
+    def setup(self):
         self._setup_tables()
         self._upgrade_database()
 
@@ -57,6 +90,15 @@ class AccountabilityDB:
             )"""
         )
 
+        self.cursor.execute(
+            """CREATE TABLE IF NOT EXISTS accountability_digests (
+                user_id INTEGER,
+                digest_date TEXT,
+                message_id INTEGER,
+                PRIMARY KEY (user_id, digest_date)
+            )"""
+        )
+
         self.cursor.execute(
             """CREATE TABLE IF NOT EXISTS user_reminders (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -95,6 +137,21 @@ class AccountabilityDB:
                 "ALTER TABLE accountability_logs ADD COLUMN reward INTEGER DEFAULT 0"
             )
 
+        # Day, week and history lookups all filter on user_id first; the date
+        # predicates compare ISO strings directly so these indexes are usable
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_logs_user_date_time ON accountability_logs(user_id, logged_date, logged_time)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_logs_user_time ON accountability_logs(user_id, logged_time)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reminders_time ON user_reminders(reminder_time, is_active)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_user_items_user ON user_items(user_id)"
+        )
+
         self.conn.commit()
 
     def get_user_stats(self, user_id):
@@ -148,6 +205,76 @@ class AccountabilityDB:
         self.conn.commit()
         return self.cursor.lastrowid
 
+    def add_task(self, user_id, task, today, logged_time, helpers):
+        """Log a task and apply the streak, bonus and reward in one transaction.
+
+        Returns everything the /log add embed needs.
+        """
+        conn, cursor = self.conn, self.cursor
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute(
+                "SELECT novacoins, streak, last_logged, highest_streak, weekly_target FROM accountability WHERE user_id = ?",
+                (user_id,),
+            )
+            row = cursor.fetchone()
+
+            if row:
+                novacoins, streak, last_logged, highest_streak, weekly_target = row
+                last_logged = (
+                    datetime.strptime(last_logged, "%Y-%m-%d").date()
+                    if last_logged
+                    else None
+                )
+                if last_logged != today:
+                    if helpers.calculate_streak(last_logged, today):
+                        streak += 1
+                    else:
+                        streak = 1
+                    novacoins += helpers.calculate_novacoins_bonus(streak)
+            else:
+                novacoins, streak, highest_streak, weekly_target = 10, 1, 1, 5
+                cursor.execute(
+                    "INSERT INTO accountability (user_id, novacoins, streak, last_logged, highest_streak, total_tasks) VALUES (?, ?, ?, ?, ?, ?)",
+                    (user_id, novacoins, streak, today, streak, 0),
+                )
+
+            cursor.execute(
+                "SELECT task FROM accountability_logs WHERE user_id = ? AND logged_date = ? ORDER BY logged_time ASC",
+                (user_id, today),
+            )
+            tasks = [entry[0] for entry in cursor.fetchall()]
+            tasks.append(task)
+
+            reward = helpers.calculate_task_reward(task, len(tasks), streak)
+            novacoins += reward
+            highest_streak = max(highest_streak, streak)
+
+            cursor.execute(
+                "INSERT INTO accountability_logs (user_id, task, logged_date, logged_time, reward) VALUES (?, ?, ?, ?, ?)",
+                (user_id, task, today, logged_time, reward),
+            )
+            cursor.execute(
+                "UPDATE accountability SET novacoins = ?, streak = ?, last_logged = ?, highest_streak = ?, total_tasks = total_tasks + 1 WHERE user_id = ?",
+                (novacoins, streak, today, highest_streak, user_id),
+            )
+            weekly_count = self.get_weekly_tasks_count(user_id)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        return {
+            "tasks": tasks,
+            "novacoins": novacoins,
+            "reward": reward,
+            "streak": streak,
+            "highest_streak": highest_streak,
+            "weekly_count": weekly_count,
+            "weekly_target": weekly_target,
+            "new_user": row is None,
+        }
+
     def get_tasks_for_day(self, user_id, date):
         """Get all tasks for a user on a specific day."""
         self.cursor.execute(
@@ -196,6 +323,32 @@ class AccountabilityDB:
         )
         self.conn.commit()
 
+    def get_digest_message_id(self, user_id, date):
+        """Get the ID of the user's channel digest message for a day."""
+        self.cursor.execute(
+            "SELECT message_id FROM accountability_digests WHERE user_id = ? AND digest_date = ?",
+            (user_id, date),
+        )
+        result = self.cursor.fetchone()
+        if result:
+            return result[0]
+
+        # Digests posted before the digests table stored their ID on the logs
+        self.cursor.execute(
+            "SELECT MAX(message_id) FROM accountability_logs WHERE user_id = ? AND logged_date = ?",
+            (user_id, date),
+        )
+        return self.cursor.fetchone()[0]
+
+    def set_digest_message_id(self, user_id, date, message_id):
+        """Remember the user's channel digest message for a day."""
+        self.cursor.execute(
+            "INSERT INTO accountability_digests (user_id, digest_date, message_id) VALUES (?, ?, ?) "
+            "ON CONFLICT (user_id, digest_date) DO UPDATE SET message_id = excluded.message_id",
+            (user_id, date, message_id),
+        )
+        self.conn.commit()
+
     def get_user_history(self, user_id, limit=10):
         """Get a user's task history."""
         self.cursor.execute(
@@ -225,8 +378,8 @@ class AccountabilityDB:
         start_of_week = today - timedelta(days=today.weekday())
 
         self.cursor.execute(
-            "SELECT COUNT(*) FROM accountability_logs WHERE user_id = ? AND date(logged_date) >= date(?)",
-            (user_id, start_of_week),
+            "SELECT COUNT(*) FROM accountability_logs WHERE user_id = ? AND logged_date >= ?",
+            (user_id, start_of_week.isoformat()),
         )
 
         return self.cursor.fetchone()[0]
@@ -251,6 +404,14 @@ class AccountabilityDB:
         except sqlite3.IntegrityError:
             return False
 
+    def get_store_item(self, item_id):
+        """Get an active store item by its ID."""
+        self.cursor.execute(
+            "SELECT name, description, price FROM store_items WHERE id = ? AND is_active = 1",
+            (item_id,),
+        )
+        return self.cursor.fetchone()
+
     def get_store_items(self):
         """Get all active items from the store."""
         self.cursor.execute(
@@ -307,6 +468,9 @@ class AccountabilityDB:
             "DELETE FROM accountability_logs WHERE user_id = ?", (user_id,)
         )
         self.cursor.execute("DELETE FROM user_items WHERE user_id = ?", (user_id,))
+        self.cursor.execute(
+            "DELETE FROM accountability_digests WHERE user_id = ?", (user_id,)
+        )
         self.conn.commit()
 
     def get_all_users(self):
@@ -376,8 +540,11 @@ class AccountabilityDB:
         return self.cursor.fetchall()
 
     def close(self):
-        """Close the database connection."""
-        self.conn.close()
+        """Close every connection opened by the store."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
 
     def get_weekly_logs(self, user_id):
         """Get all tasks logged by a user in the current week."""
@@ -386,8 +553,155 @@ class AccountabilityDB:
         start_of_week = today - timedelta(days=today.weekday())
 
         self.cursor.execute(
-            "SELECT task, logged_date, logged_time, reward FROM accountability_logs WHERE user_id = ? AND date(logged_date) >= date(?) ORDER BY logged_time DESC",
-            (user_id, start_of_week),
+            "SELECT task, logged_date, logged_time, reward FROM accountability_logs WHERE user_id = ? AND logged_date >= ? ORDER BY logged_time DESC",
+            (user_id, start_of_week.isoformat()),
         )
 
         return self.cursor.fetchall()
+
+
+class AccountabilityDB:
+    """Async facade over AccountabilityStore.
+
+    Writes are serialized on a single writer thread and reads go to a small
+    pool of reader threads, so no query ever runs on the event loop.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ACCOUNTABILITY_DB_PATH,
+        readers: int = ACCOUNTABILITY_DB_READERS,
+    ):
+        self.store = AccountabilityStore(db_path)
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="accountability-writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=max(readers, 1), thread_name_prefix="accountability-reader"
+        )
+        self._writer.submit(self.store.setup).result()
+
+    async def _run(self, executor, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _read(self, func, *args, **kwargs):
+        return await self._run(self._readers, func, *args, **kwargs)
+
+    async def _write(self, func, *args, **kwargs):
+        return await self._run(self._writer, func, *args, **kwargs)
+
+    async def get_user_stats(self, user_id):
+        return await self._read(self.store.get_user_stats, user_id)
+
+    async def update_user_stats(
+        self, user_id, novacoins, streak, last_logged, highest_streak=None
+    ):
+        return await self._write(
+            self.store.update_user_stats,
+            user_id,
+            novacoins,
+            streak,
+            last_logged,
+            highest_streak,
+        )
+
+    async def create_user(self, user_id, novacoins, streak, last_logged):
+        return await self._write(
+            self.store.create_user, user_id, novacoins, streak, last_logged
+        )
+
+    async def log_task(self, user_id, task, logged_date, logged_time, reward=0):
+        return await self._write(
+            self.store.log_task, user_id, task, logged_date, logged_time, reward
+        )
+
+    async def add_task(self, user_id, task, today, logged_time, helpers):
+        return await self._write(
+            self.store.add_task, user_id, task, today, logged_time, helpers
+        )
+
+    async def get_tasks_for_day(self, user_id, date):
+        return await self._read(self.store.get_tasks_for_day, user_id, date)
+
+    async def get_task_by_number(self, user_id, date, task_number):
+        return await self._read(
+            self.store.get_task_by_number, user_id, date, task_number
+        )
+
+    async def delete_task(self, task_id):
+        return await self._write(self.store.delete_task, task_id)
+
+    async def update_task_message_id(self, user_id, date, message_id):
+        return await self._write(
+            self.store.update_task_message_id, user_id, date, message_id
+        )
+
+    async def get_digest_message_id(self, user_id, date):
+        return await self._read(self.store.get_digest_message_id, user_id, date)
+
+    async def set_digest_message_id(self, user_id, date, message_id):
+        return await self._write(
+            self.store.set_digest_message_id, user_id, date, message_id
+        )
+
+    async def get_user_history(self, user_id, limit=10):
+        return await self._read(self.store.get_user_history, user_id, limit)
+
+    async def get_leaderboard(self, limit=10, by_streak=False):
+        return await self._read(self.store.get_leaderboard, limit, by_streak)
+
+    async def get_weekly_tasks_count(self, user_id):
+        return await self._read(self.store.get_weekly_tasks_count, user_id)
+
+    async def get_weekly_logs(self, user_id):
+        return await self._read(self.store.get_weekly_logs, user_id)
+
+    async def update_weekly_target(self, user_id, target):
+        return await self._write(self.store.update_weekly_target, user_id, target)
+
+    async def add_store_item(self, name, description, price):
+        return await self._write(self.store.add_store_item, name, description, price)
+
+    async def get_store_item(self, item_id):
+        return await self._read(self.store.get_store_item, item_id)
+
+    async def get_store_items(self):
+        return await self._read(self.store.get_store_items)
+
+    async def purchase_item(self, user_id, item_id):
+        return await self._write(self.store.purchase_item, user_id, item_id)
+
+    async def get_user_items(self, user_id, unused_only=False):
+        return await self._read(self.store.get_user_items, user_id, unused_only)
+
+    async def use_item(self, user_item_id):
+        return await self._write(self.store.use_item, user_item_id)
+
+    async def reset_user(self, user_id):
+        return await self._write(self.store.reset_user, user_id)
+
+    async def get_all_users(self):
+        return await self._read(self.store.get_all_users)
+
+    async def set_reminder(self, user_id, reminder_time):
+        return await self._write(self.store.set_reminder, user_id, reminder_time)
+
+    async def get_user_reminder(self, user_id):
+        return await self._read(self.store.get_user_reminder, user_id)
+
+    async def delete_reminder(self, user_id):
+        return await self._write(self.store.delete_reminder, user_id)
+
+    async def get_all_active_reminders(self, current_hour=None, current_minute=None):
+        return await self._read(
+            self.store.get_all_active_reminders, current_hour, current_minute
+        )
+
+    def close(self):
+        """Wait for queued queries, then close all connections."""
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        self.store.close()
@@ -1,26 +1,62 @@
+import asyncio
 import os
 import random
+from collections import OrderedDict
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 
-from groq import Groq
+from groq import AsyncGroq
+
+MOTIVATION_BUDGET_SECONDS = float(os.getenv("MOTIVATION_BUDGET_SECONDS", "2"))
+MOTIVATION_TIMEOUT_SECONDS = float(os.getenv("MOTIVATION_TIMEOUT_SECONDS", "20"))
+MOTIVATION_CACHE_SIZE = int(os.getenv("MOTIVATION_CACHE_SIZE", "128"))
 
 
 class AccountabilityHelpers:
     def __init__(self):
         api_key = os.getenv("API_KEY")
-        self.aiclient = Groq(api_key=api_key) if api_key else None
-
-    def generate_motivation(self, tasks):
-        """Generate a motivational message based on the user's tasks."""
+        self.aiclient = (
+            AsyncGroq(api_key=api_key, timeout=MOTIVATION_TIMEOUT_SECONDS)
+            if api_key
+            else None
+        )
+        self._motivation_cache: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def _motivation_key(tasks) -> Tuple[str, ...]:
+        return tuple(sorted({" ".join(str(t).lower().split()) for t in tasks}))
+
+    async def motivation_within_budget(
+        self, tasks, budget: float = MOTIVATION_BUDGET_SECONDS
+    ) -> Tuple[str, Optional[asyncio.Task]]:
+        """Return a motivation line within budget seconds.
+
+        When the LLM is slower than that, a fallback line is returned along with
+        the still running request, which resolves to the real line or None.
+        """
         if not tasks:
-            return "Keep going strong! Every step counts."
+            return "Keep going strong! Every step counts.", None
+
+        request = asyncio.ensure_future(self._request_motivation(tasks))
+        try:
+            message = await asyncio.wait_for(asyncio.shield(request), budget)
+        except asyncio.TimeoutError:
+            return self.fallback_motivation(), request
+        return message or self.fallback_motivation(), None
+
+    async def _request_motivation(self, tasks) -> Optional[str]:
+        key = self._motivation_key(tasks)
+        cached = self._motivation_cache.get(key)
+        if cached:
+            self._motivation_cache.move_to_end(key)
+            return cached
 
         formatted_tasks = "\n".join(f"- {t}" for t in tasks)
         motivation_prompt = f"User has logged the following tasks today:\n{formatted_tasks}\n\nProvide a single-line, powerful motivational message based on these tasks."
 
         try:
             if self.aiclient:
-                response = self.aiclient.chat.completions.create(
+                response = await self.aiclient.chat.completions.create(
                     model="llama-3.3-70b-versatile",
                     messages=[
                         {
@@ -33,10 +69,17 @@ class AccountabilityHelpers:
                     max_tokens=50,
                     top_p=1,
                 )
-                return response.choices[0].message.content.strip()
+                message = response.choices[0].message.content.strip()
+                if message:
+                    self._motivation_cache[key] = message
+                    while len(self._motivation_cache) > MOTIVATION_CACHE_SIZE:
+                        self._motivation_cache.popitem(last=False)
+                return message or None
         except Exception:
             pass
+        return None
 
+    def fallback_motivation(self):
         fallback_messages = [
             "Every task completed brings you closer to your goals!",
             "Your consistency is building something amazing!",
@@ -1,4 +1,5 @@
 from utilities.databases.link_database import LinkDatabase
+from utilities.databases.sqlite_link_database import SQLiteLinkDatabase
 from utilities.databases.task_database import TaskDatabase
 
-__all__ = ["LinkDatabase", "TaskDatabase"]
+__all__ = ["LinkDatabase", "SQLiteLinkDatabase", "TaskDatabase"]
@@ -1,66 +1,263 @@
+import atexit
+import heapq
 import json
 import os
+import tempfile
+import threading
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from utilities.databases.link_search import LinkSearchIndex
+
+
+def write_file_atomic(path: str, payload: str):
+    """Write to a temp file in the same directory and atomically swap it in.
+
+    A crash mid-write, or a reader such as the GitHub sync, never sees a
+    truncated file. The file keeps its existing permissions.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".links-", suffix=".json.tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _category_key(link: Dict) -> str:
+    return link.get("category") or "uncategorized"
+
+
+def _domain_key(link: Dict) -> str:
+    return link.get("domain") or "unknown"
+
+
+class LinkStats:
+    """Running link totals by category and domain."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.categories: Counter = Counter()
+        self.domains: Counter = Counter()
+
+    def rebuild(self, links: List[Dict]) -> None:
+        self.total = len(links)
+        self.categories = Counter(_category_key(link) for link in links)
+        self.domains = Counter(_domain_key(link) for link in links)
+
+    def add(self, link: Dict) -> None:
+        self.total += 1
+        self.categories[_category_key(link)] += 1
+        self.domains[_domain_key(link)] += 1
+
+    def recategorize(self, old: Optional[str], new: Optional[str]) -> None:
+        old_key = old or "uncategorized"
+        new_key = new or "uncategorized"
+        if old_key == new_key:
+            return
+        self.categories[old_key] -= 1
+        if self.categories[old_key] <= 0:
+            del self.categories[old_key]
+        self.categories[new_key] += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "total": self.total,
+            "categories": dict(self.categories),
+            "domains": dict(self.domains),
+        }
+
 
 class LinkDatabase:
-    def __init__(self, db_path: str = "data/links.json"):
+    def __init__(
+        self,
+        db_path: str = "data/links.json",
+        flush_delay: float = 2.0,
+        max_pending: int = 50,
+    ):
         self.db_path = db_path
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self._data: Optional[Dict] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._index = LinkSearchIndex()
+        self._stats = LinkStats()
+        # id -> link entry, so search hits are looked up instead of scanned
+        self._links_by_id: Dict[int, Dict] = {}
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._pending = 0
+        self._writing = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._listeners: List[Callable[[], None]] = []
         self._ensure_file()
+        atexit.register(self.flush)
+
+    def add_change_listener(self, callback: Callable[[], None]):
+        # Called after each write to links.json, possibly from the flush timer
+        # thread, so callbacks should only record that something changed.
+        self._listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify_changed(self):
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"[LinkDatabase] Change listener failed: {e}")
 
     def _ensure_file(self):
         if not os.path.exists(self.db_path):
-            self._save_data({"links": [], "next_id": 1})
+            self._data = {"links": [], "next_id": 1}
+            self._write_file(json.dumps(self._data, indent=2, ensure_ascii=False))
+            self._stamp = self._file_stamp()
 
-    def _load_data(self) -> Dict:
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
         try:
-            with open(self.db_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {"links": [], "next_id": 1}
+            stat = os.stat(self.db_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_data(self) -> Dict:
+        # The file is cached in memory and only re-read when another writer
+        # (e.g. the GitHub sync pulling a fresh copy) has changed it. Unflushed
+        # changes always win over the copy on disk.
+        with self._lock:
+            if self._data is not None and (self._pending or self._writing):
+                return self._data
+            stamp = self._file_stamp()
+            if self._data is not None and stamp == self._stamp:
+                return self._data
+            try:
+                with open(self.db_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                data = {"links": [], "next_id": 1}
+            self._data = data
+            self._stamp = stamp
+            self._index.rebuild(data["links"])
+            self._stats.rebuild(data["links"])
+            self._links_by_id = {link["id"]: link for link in data["links"]}
+            return data
+
+    def _write_file(self, payload: str):
+        write_file_atomic(self.db_path, payload)
+
+    def _save_data(self, data: Dict) -> bool:
+        # Coalesce writes: the first change arms a timer, and a burst of
+        # changes reaching max_pending is flushed right away in the background.
+        # Returns True when the caller should flush itself, which it must do
+        # after releasing _lock (flush takes _write_lock before _lock).
+        with self._lock:
+            self._data = data
+            self._pending += 1
+            if self.flush_delay <= 0:
+                return True
+            if self._pending >= self.max_pending and self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._flush_timer is None:
+                delay = 0 if self._pending >= self.max_pending else self.flush_delay
+                self._flush_timer = threading.Timer(delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            return False
+
+    def flush(self):
+        # Lock order is always _write_lock, then _lock. _lock is only held to
+        # take a shallow snapshot; serializing and writing happen without it.
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._pending or self._data is None:
+                    return
+                pending = self._pending
+                snapshot = dict(self._data)
+                snapshot["links"] = [dict(link) for link in self._data["links"]]
+                self._pending = 0
+                self._writing = True
+            try:
+                self._write_file(json.dumps(snapshot, indent=2, ensure_ascii=False))
+            except Exception:
+                with self._lock:
+                    self._pending += pending
+                raise
+            finally:
+                with self._lock:
+                    self._writing = False
+                    self._stamp = self._file_stamp()
+        self._notify_changed()
 
-    def _save_data(self, data: Dict):
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with open(self.db_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
 
     def save_links(self, links: List[Dict]) -> List[Dict]:
         saved = []
-        data = self._load_data()
+        flush_now = False
+        with self._lock:
+            data = self._load_data()
 
-        existing_keys = {(link["message_id"], link["url"]) for link in data["links"]}
+            existing_keys = {
+                (link["message_id"], link["url"]) for link in data["links"]
+            }
 
-        for link in links:
-            key = (link["message_id"], link["url"])
-            if key in existing_keys:
-                continue
+            for link in links:
+                key = (link["message_id"], link["url"])
+                if key in existing_keys:
+                    continue
 
-            link_entry = {
-                "id": data["next_id"],
-                "url": link["url"],
-                "normalized_url": link.get("normalized_url"),
-                "domain": link.get("domain"),
-                "title": None,
-                "description": None,
-                "site_name": None,
-                "image_url": None,
-                "context": None,
-                "category": None,
-                "message_id": link["message_id"],
-                "message_link": link["message_link"],
-                "channel_id": link["channel_id"],
-                "category_id": link["category_id"],
-                "author_id": link["author_id"],
-                "created_at": datetime.utcnow().isoformat(),
-            }
-            data["links"].append(link_entry)
-            data["next_id"] += 1
-            saved.append({"id": link_entry["id"], "url": link["url"]})
-            existing_keys.add(key)
+                link_entry = {
+                    "id": data["next_id"],
+                    "url": link["url"],
+                    "normalized_url": link.get("normalized_url"),
+                    "domain": link.get("domain"),
+                    "title": None,
+                    "description": None,
+                    "site_name": None,
+                    "image_url": None,
+                    "context": None,
+                    "category": None,
+                    "message_id": link["message_id"],
+                    "message_link": link["message_link"],
+                    "channel_id": link["channel_id"],
+                    "category_id": link["category_id"],
+                    "author_id": link["author_id"],
+                    "created_at": datetime.utcnow().isoformat(),
+                }
+                data["links"].append(link_entry)
+                self._index.add(link_entry)
+                self._stats.add(link_entry)
+                self._links_by_id[link_entry["id"]] = link_entry
+                data["next_id"] += 1
+                saved.append({"id": link_entry["id"], "url": link["url"]})
+                existing_keys.add(key)
 
-        self._save_data(data)
+            if saved:
+                flush_now = self._save_data(data)
+        if flush_now:
+            self.flush()
         return saved
 
     def update_metadata(
@@ -73,17 +270,26 @@ class LinkDatabase:
         category: Optional[str] = None,
         context: Optional[str] = None,
     ):
-        data = self._load_data()
-        for link in data["links"]:
-            if link["id"] == link_id:
+        with self._lock:
+            data = self._load_data()
+            link = self._links_by_id.get(link_id)
+            if link is not None:
+                self._stats.recategorize(link.get("category"), category)
                 link["title"] = title
                 link["description"] = description
                 link["site_name"] = site_name
                 link["image_url"] = image_url
                 link["category"] = category
                 link["context"] = context
-                break
-        self._save_data(data)
+                self._index.add(link)
+            flush_now = self._save_data(data)
+        if flush_now:
+            self.flush()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._load_data()
+            return self._stats.snapshot()
 
     def count_links(
         self,
@@ -93,11 +299,10 @@ class LinkDatabase:
         category: Optional[str] = None,
         exclude_domains: Optional[List[str]] = None,
     ) -> int:
-        return len(
-            self._filter_links(
-                query, user_id, category_id, category, exclude_domains=exclude_domains
-            )
+        results, _ = self._filter_links(
+            query, user_id, category_id, category, exclude_domains=exclude_domains
         )
+        return len(results)
 
     def get_links(
         self,
@@ -109,15 +314,67 @@ class LinkDatabase:
         limit: int = 25,
         offset: int = 0,
     ) -> List[Dict]:
-        filtered = self._filter_links(
+        filtered, scores = self._filter_links(
             query, user_id, category_id, category, exclude_domains=exclude_domains
         )
-        filtered.sort(key=lambda x: (x.get("created_at") or "", x["id"]), reverse=True)
+        filtered.sort(
+            key=lambda x: (
+                scores.get(x["id"], 0.0) if scores else 0.0,
+                x.get("created_at") or "",
+                x["id"],
+            ),
+            reverse=True,
+        )
         return filtered[offset : offset + limit]
 
+    def page_links(
+        self,
+        query: Optional[str] = None,
+        user_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        category: Optional[str] = None,
+        exclude_domains: Optional[List[str]] = None,
+        limit: int = 25,
+        cursor: Optional[Tuple] = None,
+    ) -> Dict:
+        filtered, scores = self._filter_links(
+            query, user_id, category_id, category, exclude_domains=exclude_domains
+        )
+
+        def sort_key(link: Dict) -> Tuple:
+            key = (link.get("created_at") or "", link["id"])
+            if scores is not None:
+                return (scores.get(link["id"], 0.0),) + key
+            return key
+
+        candidates = filtered
+        if cursor is not None:
+            cursor = tuple(cursor)
+            candidates = (link for link in filtered if sort_key(link) < cursor)
+        entries = heapq.nlargest(limit, candidates, key=sort_key)
+        next_cursor = sort_key(entries[-1]) if len(entries) == limit else None
+        # Matches the SQLite store, which only counts on the first page
+        total = len(filtered) if cursor is None else None
+        return {"links": entries, "total": total, "next_cursor": next_cursor}
+
+    def get_unenriched_links(self) -> List[Dict]:
+        data = self._load_data()
+        return [
+            {"id": link["id"], "url": link["url"], "domain": link.get("domain")}
+            for link in data["links"]
+            if link.get("title") is None and link.get("category") is None
+        ]
+
     def get_all_links(self) -> List[Dict]:
+        # Copied under the lock, since callers (e.g. the sync export) read the
+        # result on another thread while links keep being saved
+        with self._lock:
+            return [dict(link) for link in self._load_data()["links"]]
+
+    def get_links_after(self, after_id: int, limit: int = 50) -> List[Dict]:
         data = self._load_data()
-        return data["links"]
+        links = [link for link in data["links"] if link["id"] > after_id]
+        return heapq.nsmallest(limit, links, key=lambda link: link["id"])
 
     def _filter_links(
         self,
@@ -126,14 +383,25 @@ class LinkDatabase:
         category_id: Optional[int],
         category: Optional[str],
         exclude_domains: Optional[List[str]],
-    ) -> List[Dict]:
+    ) -> Tuple[List[Dict], Optional[Dict[int, float]]]:
         data = self._load_data()
         results = []
+        scores = self._index.search(query) if query else None
         normalized_excludes = [
             domain.lstrip(".").lower() for domain in (exclude_domains or []) if domain
         ]
 
-        for link in data["links"]:
+        if scores is not None:
+            # Only the search hits can match, so skip scanning every link
+            candidates = [
+                self._links_by_id[link_id]
+                for link_id in scores
+                if link_id in self._links_by_id
+            ]
+        else:
+            candidates = data["links"]
+
+        for link in candidates:
             if normalized_excludes and self._is_excluded_domain(
                 link.get("domain"), link.get("url"), normalized_excludes
             ):
@@ -144,7 +412,7 @@ class LinkDatabase:
                 continue
             if category and link.get("category") != category:
                 continue
-            if query:
+            if scores is None and query:
                 query_lower = query.lower()
                 searchable = " ".join(
                     str(v or "").lower()
@@ -161,7 +429,7 @@ class LinkDatabase:
                     continue
             results.append(link)
 
-        return results
+        return results, scores
 
     @staticmethod
     def _is_excluded_domain(
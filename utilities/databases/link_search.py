@@ -0,0 +1,122 @@
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+SEARCH_FIELDS = {
+    "url": 1.0,
+    "title": 3.0,
+    "description": 1.0,
+    "site_name": 2.0,
+    "domain": 2.0,
+    "context": 1.0,
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def build_fts_query(query: Optional[str]) -> Optional[str]:
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in dict.fromkeys(tokens))
+
+
+class LinkSearchIndex:
+    """In-process inverted index over the searchable link fields."""
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._doc_tokens: Dict[int, Set[str]] = {}
+        self._vocab: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def rebuild(self, links: List[Dict]) -> None:
+        self._postings = {}
+        self._doc_tokens = {}
+        self._vocab = []
+        for link in links:
+            self.add(link)
+
+    def add(self, link: Dict) -> None:
+        link_id = link["id"]
+        self.remove(link_id)
+
+        weights: Dict[str, float] = {}
+        for field, weight in SEARCH_FIELDS.items():
+            for token in tokenize(link.get(field)):
+                weights[token] = weights.get(token, 0.0) + weight
+
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocab, token)
+            postings[link_id] = weight
+        self._doc_tokens[link_id] = set(weights)
+
+    def remove(self, link_id: int) -> None:
+        for token in self._doc_tokens.pop(link_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(link_id, None)
+            if not postings:
+                del self._postings[token]
+                idx = bisect_left(self._vocab, token)
+                if idx < len(self._vocab) and self._vocab[idx] == token:
+                    self._vocab.pop(idx)
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect_left(self._vocab, prefix)
+        matches = []
+        for token in self._vocab[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def search(self, query: Optional[str]) -> Optional[Dict[int, float]]:
+        """Return link ids matching every query term (as a prefix) with scores.
+
+        Returns None when the query has no searchable tokens so callers can
+        fall back to a plain substring match.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return None
+
+        total_docs = max(len(self._doc_tokens), 1)
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            term_scores: Dict[int, float] = {}
+            for token in self._expand(term):
+                postings = self._postings[token]
+                idf = math.log(1 + total_docs / len(postings))
+                # Exact token matches outrank prefix expansions
+                boost = 1.0 if token == term else 0.5
+                for link_id, weight in postings.items():
+                    score = weight * idf * boost
+                    if score > term_scores.get(link_id, 0.0):
+                        term_scores[link_id] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    link_id: score + term_scores[link_id]
+                    for link_id, score in scores.items()
+                    if link_id in term_scores
+                }
+            if not scores:
+                return {}
+
+        return scores or {}
@@ -0,0 +1,27 @@
+"""Import links.json into the SQLite link store.
+
+Usage: python -m utilities.databases.migrate [json_path] [db_path]
+"""
+
+import os
+import sys
+from typing import List
+
+from utilities.databases.sqlite_link_database import SQLiteLinkDatabase
+
+
+def main(argv: List[str]) -> int:
+    json_path = argv[1] if len(argv) > 1 else "data/links.json"
+    db_path = argv[2] if len(argv) > 2 else "data/links.db"
+    if not os.path.exists(json_path):
+        print(f"{json_path} not found.")
+        return 1
+
+    db = SQLiteLinkDatabase(db_path)
+    imported = db.import_json(json_path)
+    print(f"Imported {imported} links from {json_path} into {db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
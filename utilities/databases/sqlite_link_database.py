@@ -0,0 +1,543 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from utilities.databases.link_database import write_file_atomic
+from utilities.databases.link_search import SEARCH_FIELDS, build_fts_query
+
+LINK_COLUMNS = [
+    "id",
+    "url",
+    "normalized_url",
+    "domain",
+    "title",
+    "description",
+    "site_name",
+    "image_url",
+    "context",
+    "category",
+    "message_id",
+    "message_link",
+    "channel_id",
+    "category_id",
+    "author_id",
+    "created_at",
+]
+
+FTS_COLUMNS = list(SEARCH_FIELDS)
+FTS_WEIGHTS = ", ".join(str(weight) for weight in SEARCH_FIELDS.values())
+
+
+def _link_domain(link: Dict) -> str:
+    return link.get("domain") or urlparse(link.get("url") or "").netloc.lower()
+
+
+class SQLiteLinkDatabase:
+    def __init__(self, db_path: str = "data/links.db"):
+        self.db_path = db_path
+        self.revision = 0
+        self.fts_enabled = False
+        self._listeners: List[Callable[[], None]] = []
+        self.init_db()
+
+    def add_change_listener(self, callback: Callable[[], None]):
+        self._listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _mark_changed(self):
+        self.revision += 1
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"[LinkDatabase] Change listener failed: {e}")
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS links (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    normalized_url TEXT,
+                    domain TEXT,
+                    title TEXT,
+                    description TEXT,
+                    site_name TEXT,
+                    image_url TEXT,
+                    context TEXT,
+                    category TEXT,
+                    message_id INTEGER NOT NULL,
+                    message_link TEXT,
+                    channel_id INTEGER,
+                    category_id INTEGER,
+                    author_id INTEGER,
+                    created_at TEXT
+                )
+                """
+            )
+
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_links_message_url ON links(message_id, url)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_links_author ON links(author_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_links_category_id ON links(category_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_links_category ON links(category)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_links_created ON links(created_at, id)"
+            )
+            # Keyset pagination compares (created_at, id) row values, where a
+            # NULL would never match; store missing timestamps as '' instead,
+            # which also sorts them last like the JSON backend does
+            conn.execute("UPDATE links SET created_at = '' WHERE created_at IS NULL")
+            # Domain exclusion filters on the stored domain alone, so fill it
+            # in for rows saved without one
+            missing = conn.execute(
+                "SELECT id, url FROM links WHERE domain IS NULL OR domain = ''"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE links SET domain = ? WHERE id = ?",
+                [(_link_domain(dict(row)), row["id"]) for row in missing],
+            )
+
+            self.fts_enabled = self._init_fts(conn)
+            self._init_counts(conn)
+
+            conn.commit()
+
+    def _init_counts(self, conn: sqlite3.Connection):
+        # Totals by category and domain, kept current by triggers so stats
+        # never need a scan of the links table
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            ("link_counts",),
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS link_counts (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+            """
+        )
+        def upsert(kind: str, key: str, delta: int) -> str:
+            return (
+                f"INSERT INTO link_counts (kind, key, count) "
+                f"VALUES ('{kind}', {key}, {delta}) "
+                f"ON CONFLICT (kind, key) DO UPDATE SET count = count + ({delta});"
+            )
+
+        def bump(row: str, delta: int) -> str:
+            category = f"COALESCE({row}.category, 'uncategorized')"
+            domain = f"COALESCE({row}.domain, 'unknown')"
+            return upsert("category", category, delta) + upsert(
+                "domain", domain, delta
+            )
+
+        triggers = {
+            "link_counts_insert": (
+                "AFTER INSERT ON links",
+                upsert("total", "''", 1) + bump("new", 1),
+            ),
+            "link_counts_delete": (
+                "AFTER DELETE ON links",
+                upsert("total", "''", -1) + bump("old", -1),
+            ),
+            "link_counts_update": (
+                "AFTER UPDATE OF category, domain ON links",
+                bump("old", -1) + bump("new", 1),
+            ),
+        }
+        for name, (event, body) in triggers.items():
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END"
+            )
+        if not exists:
+            conn.execute(
+                """
+                INSERT INTO link_counts (kind, key, count)
+                SELECT 'total', '', COUNT(*) FROM links
+                UNION ALL
+                SELECT 'category', COALESCE(category, 'uncategorized'), COUNT(*)
+                FROM links GROUP BY 1, 2
+                UNION ALL
+                SELECT 'domain', COALESCE(domain, 'unknown'), COUNT(*)
+                FROM links GROUP BY 1, 2
+                """
+            )
+
+    def get_stats(self) -> Dict:
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                "SELECT kind, key, count FROM link_counts WHERE count > 0"
+            ).fetchall()
+        stats = {"total": 0, "categories": {}, "domains": {}}
+        for row in rows:
+            if row["kind"] == "total":
+                stats["total"] = row["count"]
+            elif row["kind"] == "category":
+                stats["categories"][row["key"]] = row["count"]
+            else:
+                stats["domains"][row["key"]] = row["count"]
+        return stats
+
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'links_fts'"
+        ).fetchone()
+        columns = ", ".join(FTS_COLUMNS)
+        new_columns = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+        old_columns = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+        try:
+            conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS links_fts USING fts5(
+                    {columns},
+                    content='links',
+                    content_rowid='id'
+                )
+                """
+            )
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, fall back to substring matching
+            return False
+
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS links_fts_insert AFTER INSERT ON links BEGIN
+                INSERT INTO links_fts(rowid, {columns}) VALUES (new.id, {new_columns});
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS links_fts_delete AFTER DELETE ON links BEGIN
+                INSERT INTO links_fts(links_fts, rowid, {columns})
+                VALUES ('delete', old.id, {old_columns});
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS links_fts_update AFTER UPDATE ON links BEGIN
+                INSERT INTO links_fts(links_fts, rowid, {columns})
+                VALUES ('delete', old.id, {old_columns});
+                INSERT INTO links_fts(rowid, {columns}) VALUES (new.id, {new_columns});
+            END
+            """
+        )
+        if not exists:
+            conn.execute("INSERT INTO links_fts(links_fts) VALUES ('rebuild')")
+        return True
+
+    def save_links(self, links: List[Dict]) -> List[Dict]:
+        saved = []
+        with self._get_conn() as conn:
+            for link in links:
+                cursor = conn.execute(
+                    """
+                    INSERT OR IGNORE INTO links (
+                        url,
+                        normalized_url,
+                        domain,
+                        message_id,
+                        message_link,
+                        channel_id,
+                        category_id,
+                        author_id,
+                        created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        link["url"],
+                        link.get("normalized_url"),
+                        _link_domain(link),
+                        link["message_id"],
+                        link["message_link"],
+                        link["channel_id"],
+                        link["category_id"],
+                        link["author_id"],
+                        datetime.utcnow().isoformat(),
+                    ),
+                )
+                if cursor.rowcount:
+                    saved.append({"id": cursor.lastrowid, "url": link["url"]})
+            conn.commit()
+
+        if saved:
+            self._mark_changed()
+        return saved
+
+    def update_metadata(
+        self,
+        link_id: int,
+        title: Optional[str],
+        description: Optional[str],
+        site_name: Optional[str],
+        image_url: Optional[str],
+        category: Optional[str] = None,
+        context: Optional[str] = None,
+    ):
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                UPDATE links
+                SET title = ?, description = ?, site_name = ?, image_url = ?,
+                    category = ?, context = ?
+                WHERE id = ?
+                """,
+                (title, description, site_name, image_url, category, context, link_id),
+            )
+            conn.commit()
+        self._mark_changed()
+
+    def _build_filters(
+        self,
+        query: Optional[str],
+        user_id: Optional[int],
+        category_id: Optional[int],
+        category: Optional[str],
+        exclude_domains: Optional[List[str]],
+    ) -> tuple[str, str, list]:
+        clauses = []
+        params: list = []
+        source = "links"
+        normalized_excludes = [
+            domain.lstrip(".").lower() for domain in (exclude_domains or []) if domain
+        ]
+        for excluded in normalized_excludes:
+            # The domain itself or any subdomain, with or without a port
+            pattern = excluded.replace("\\", "\\\\").replace("%", "\\%")
+            pattern = pattern.replace("_", "\\_")
+            clauses.append(
+                "NOT (coalesce(links.domain, '') = ? "
+                "OR coalesce(links.domain, '') LIKE ? ESCAPE '\\' "
+                "OR coalesce(links.domain, '') LIKE ? ESCAPE '\\' "
+                "OR coalesce(links.domain, '') LIKE ? ESCAPE '\\')"
+            )
+            params += [excluded, f"%.{pattern}", f"{pattern}:%", f"%.{pattern}:%"]
+        if user_id:
+            clauses.append("links.author_id = ?")
+            params.append(user_id)
+        if category_id:
+            clauses.append("links.category_id = ?")
+            params.append(category_id)
+        if category:
+            clauses.append("links.category = ?")
+            params.append(category)
+        fts_query = build_fts_query(query) if self.fts_enabled else None
+        if fts_query:
+            source = "links JOIN links_fts ON links_fts.rowid = links.id"
+            clauses.append("links_fts MATCH ?")
+            params.append(fts_query)
+        elif query:
+            searchable = " || ' ' || ".join(
+                f"coalesce(links.{column}, '')" for column in FTS_COLUMNS
+            )
+            clauses.append(f"instr(lower({searchable}), ?) > 0")
+            params.append(query.lower())
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return source, where, params
+
+    def count_links(
+        self,
+        query: Optional[str] = None,
+        user_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        category: Optional[str] = None,
+        exclude_domains: Optional[List[str]] = None,
+    ) -> int:
+        source, where, params = self._build_filters(
+            query, user_id, category_id, category, exclude_domains
+        )
+        with self._get_conn() as conn:
+            row = conn.execute(
+                f"SELECT COUNT(*) FROM {source} {where}", params
+            ).fetchone()
+            return int(row[0])
+
+    def get_links(
+        self,
+        query: Optional[str] = None,
+        user_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        category: Optional[str] = None,
+        exclude_domains: Optional[List[str]] = None,
+        limit: int = 25,
+        offset: int = 0,
+    ) -> List[Dict]:
+        source, where, params = self._build_filters(
+            query, user_id, category_id, category, exclude_domains
+        )
+        # created_at is never NULL (see init_db), so the raw column can use
+        # idx_links_created instead of sorting the whole table
+        order_by = "links.created_at DESC, links.id DESC"
+        if source != "links":
+            order_by = f"bm25(links_fts, {FTS_WEIGHTS}), {order_by}"
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT links.* FROM {source} {where}
+                ORDER BY {order_by}
+                LIMIT ? OFFSET ?
+                """,
+                params + [limit, offset],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def page_links(
+        self,
+        query: Optional[str] = None,
+        user_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        category: Optional[str] = None,
+        exclude_domains: Optional[List[str]] = None,
+        limit: int = 25,
+        cursor: Optional[Tuple] = None,
+    ) -> Dict:
+        source, where, params = self._build_filters(
+            query, user_id, category_id, category, exclude_domains
+        )
+        ranked = source != "links"
+
+        if ranked:
+            # bm25 has to be computed for every match before ranking anyway
+            sql = f"""
+                SELECT * FROM (
+                    SELECT links.*, bm25(links_fts, {FTS_WEIGHTS}) AS rank_score
+                    FROM {source} {where}
+                )
+            """
+            page_params: list = []
+            if cursor is not None:
+                rank_score, created_at, link_id = cursor
+                sql += (
+                    " WHERE rank_score > ? OR "
+                    "(rank_score = ? AND (created_at, id) < (?, ?))"
+                )
+                page_params = [rank_score, rank_score, created_at, link_id]
+            sql += " ORDER BY rank_score ASC, created_at DESC, id DESC LIMIT ?"
+        else:
+            # Plain listings walk idx_links_created from the cursor onwards
+            page_where = where
+            page_params = []
+            if cursor is not None:
+                keyset = "(links.created_at, links.id) < (?, ?)"
+                page_where = f"{where} AND {keyset}" if where else f"WHERE {keyset}"
+                page_params = list(cursor)
+            sql = f"""
+                SELECT links.* FROM links {page_where}
+                ORDER BY links.created_at DESC, links.id DESC
+                LIMIT ?
+            """
+
+        with self._get_conn() as conn:
+            rows = conn.execute(sql, params + page_params + [limit]).fetchall()
+            # Later pages keep the total from the first one
+            total = None
+            if cursor is None:
+                total = int(
+                    conn.execute(
+                        f"SELECT COUNT(*) FROM {source} {where}", params
+                    ).fetchone()[0]
+                )
+
+        entries = []
+        next_cursor = None
+        for row in rows:
+            entry = dict(row)
+            rank_score = entry.pop("rank_score", None)
+            entries.append(entry)
+            next_cursor = (entry["created_at"], entry["id"])
+            if ranked:
+                next_cursor = (rank_score,) + next_cursor
+        if len(entries) < limit:
+            next_cursor = None
+        return {"links": entries, "total": total, "next_cursor": next_cursor}
+
+    def get_unenriched_links(self) -> List[Dict]:
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, url, domain FROM links
+                WHERE title IS NULL AND category IS NULL
+                ORDER BY id ASC
+                """
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_all_links(self) -> List[Dict]:
+        with self._get_conn() as conn:
+            rows = conn.execute("SELECT * FROM links ORDER BY id ASC").fetchall()
+        return [dict(row) for row in rows]
+
+    def get_links_after(self, after_id: int, limit: int = 50) -> List[Dict]:
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                "SELECT * FROM links WHERE id > ? ORDER BY id ASC LIMIT ?",
+                (after_id, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        # Connections are opened per call and every write is committed
+        pass
+
+    def import_json(self, json_path: str = "data/links.json") -> int:
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        placeholders = ", ".join("?" for _ in LINK_COLUMNS)
+        imported = 0
+        with self._get_conn() as conn:
+            for link in data.get("links", []):
+                cursor = conn.execute(
+                    f"INSERT OR IGNORE INTO links ({', '.join(LINK_COLUMNS)}) VALUES ({placeholders})",
+                    [
+                        (link.get(column) or "")
+                        if column == "created_at"
+                        else _link_domain(link)
+                        if column == "domain"
+                        else link.get(column)
+                        for column in LINK_COLUMNS
+                    ],
+                )
+                imported += cursor.rowcount
+            conn.commit()
+
+        if imported:
+            self._mark_changed()
+        return imported
+
+    def export_json(self, json_path: str = "data/links.json"):
+        links = self.get_all_links()
+        next_id = max((link["id"] for link in links), default=0) + 1
+        write_file_atomic(
+            json_path,
+            json.dumps(
+                {"links": links, "next_id": next_id}, indent=2, ensure_ascii=False
+            ),
+        )
@@ -1,4 +1,19 @@
-from utilities.links.classifier import LINK_CATEGORIES, LinkMetadata, analyze_link, classify_link
+from utilities.links.classifier import (
+    LINK_CATEGORIES,
+    LINK_LLM_BATCH_SIZE,
+    LinkMetadata,
+    analyze_link,
+    analyze_links,
+    classify_link,
+    configure_extract_executor,
+    get_batch_stats,
+    get_cached_analysis,
+    shutdown_extract_executor,
+)
+from utilities.links.cache import LinkAnalysisCache, get_link_cache
+from utilities.links.enrichment import EnrichmentQueue, enrich_links
+from utilities.links.fetcher import LinkFetcher
+from utilities.links.rules import RuleClassifier, get_rule_classifier
 from utilities.links.utils import (
     domain_for_url,
     extract_urls,
@@ -8,13 +23,26 @@ from utilities.links.utils import (
 )
 
 __all__ = [
+    "EnrichmentQueue",
     "LINK_CATEGORIES",
+    "LINK_LLM_BATCH_SIZE",
+    "LinkAnalysisCache",
+    "LinkFetcher",
     "LinkMetadata",
+    "RuleClassifier",
     "analyze_link",
+    "analyze_links",
     "classify_link",
+    "configure_extract_executor",
     "domain_for_url",
+    "enrich_links",
     "extract_urls",
+    "get_batch_stats",
+    "get_cached_analysis",
+    "get_link_cache",
+    "get_rule_classifier",
     "is_media_url",
     "normalize_url",
     "parse_metadata",
+    "shutdown_extract_executor",
 ]
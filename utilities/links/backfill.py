@@ -0,0 +1,189 @@
+"""Re-run link analysis over links that are already stored.
+
+Usage: python -m utilities.links.backfill [all|failed] [--restart]
+
+"failed" (the default) only revisits links without a title or category,
+or stuck on the "other"/no-context result a failed LLM call leaves behind;
+"all" re-analyzes everything, e.g. after a prompt or model change. Progress
+is checkpointed after every page of links so an interrupted run resumes
+where it stopped. With the JSON backend, stop the bot before running the
+CLI so the two processes don't overwrite each other's links.json writes.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from utilities.links.classifier import LINK_LLM_BATCH_SIZE
+from utilities.links.enrichment import enrich_links
+from utilities.links.fetcher import LinkFetcher
+from utilities.links.utils import domain_for_url
+
+LINK_BACKFILL_CONCURRENCY = int(os.getenv("LINK_BACKFILL_CONCURRENCY", "4"))
+LINK_BACKFILL_CHECKPOINT = os.getenv(
+    "LINK_BACKFILL_CHECKPOINT", "data/links_backfill.json"
+)
+BACKFILL_MODES = ["failed", "all"]
+BACKFILL_PAGE_SIZE = 50
+
+
+@dataclass
+class BackfillReport:
+    mode: str
+    last_id: int = 0
+    scanned: int = 0
+    processed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def rate(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.processed} links re-analyzed ({self.failed} still unclassified) "
+            f"out of {self.scanned} scanned in {self.elapsed:.1f}s "
+            f"({self.rate:.2f} links/s)"
+        )
+
+
+def needs_enrichment(link: Dict) -> bool:
+    if not link.get("title") or not link.get("category"):
+        return True
+    return link["category"] == "other" and not link.get("context")
+
+
+def _load_checkpoint(path: str, mode: str) -> Optional[BackfillReport]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if payload.get("mode") != mode:
+        return None
+    return BackfillReport(
+        mode=mode,
+        last_id=payload.get("last_id", 0),
+        scanned=payload.get("scanned", 0),
+        processed=payload.get("processed", 0),
+        failed=payload.get("failed", 0),
+        elapsed=payload.get("elapsed", 0.0),
+        started_at=payload.get("started_at", time.time()),
+    )
+
+
+def _save_checkpoint(path: str, report: BackfillReport):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "mode": report.mode,
+                "last_id": report.last_id,
+                "scanned": report.scanned,
+                "processed": report.processed,
+                "failed": report.failed,
+                "elapsed": report.elapsed,
+                "started_at": report.started_at,
+            },
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+async def run_backfill(
+    db,
+    fetcher: LinkFetcher,
+    mode: str = "failed",
+    concurrency: int = LINK_BACKFILL_CONCURRENCY,
+    checkpoint_path: str = LINK_BACKFILL_CHECKPOINT,
+    restart: bool = False,
+    on_progress: Optional[Callable[[BackfillReport], Awaitable[None]]] = None,
+) -> BackfillReport:
+    if mode not in BACKFILL_MODES:
+        raise ValueError(f"Unknown backfill mode: {mode}")
+
+    report = None if restart else _load_checkpoint(checkpoint_path, mode)
+    report = report or BackfillReport(mode=mode)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def process(group: List[Dict]) -> int:
+        jobs = [
+            (link["id"], link["url"], link.get("domain") or domain_for_url(link["url"]))
+            for link in group
+        ]
+        async with semaphore:
+            results = await enrich_links(db, fetcher, jobs, use_cache=False)
+        return sum(
+            1
+            for _, category, context in results.values()
+            if category == "other" and not context
+        )
+
+    while True:
+        page_started = time.perf_counter()
+        page = db.get_links_after(report.last_id, BACKFILL_PAGE_SIZE)
+        if not page:
+            break
+        targets = [link for link in page if mode == "all" or needs_enrichment(link)]
+        groups = [
+            targets[start : start + LINK_LLM_BATCH_SIZE]
+            for start in range(0, len(targets), LINK_LLM_BATCH_SIZE)
+        ]
+        failures = await asyncio.gather(*(process(group) for group in groups))
+
+        report.last_id = page[-1]["id"]
+        report.scanned += len(page)
+        report.processed += len(targets)
+        report.failed += sum(failures)
+        report.elapsed += time.perf_counter() - page_started
+        _save_checkpoint(checkpoint_path, report)
+        if on_progress:
+            await on_progress(report)
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return report
+
+
+async def _run_cli(mode: str, restart: bool) -> BackfillReport:
+    # handlers.links imports utilities.links, so import it lazily
+    from handlers.links import create_link_database
+
+    db = create_link_database()
+    fetcher = LinkFetcher()
+
+    async def print_progress(report: BackfillReport):
+        print(f"[Backfill] up to #{report.last_id}: {report.summary()}")
+
+    try:
+        return await run_backfill(
+            db, fetcher, mode=mode, restart=restart, on_progress=print_progress
+        )
+    finally:
+        await fetcher.close()
+        db.close()
+
+
+def main(argv: List[str]) -> int:
+    args = [arg for arg in argv[1:] if not arg.startswith("--")]
+    mode = args[0] if args else "failed"
+    if mode not in BACKFILL_MODES:
+        print(f"Unknown mode {mode}, expected one of {', '.join(BACKFILL_MODES)}")
+        return 1
+
+    report = asyncio.run(_run_cli(mode, "--restart" in argv))
+    print(f"[Backfill] Done: {report.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,246 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from utilities.links.utils import normalize_url
+
+LINK_CACHE_PATH = os.getenv("LINK_CACHE_PATH", "data/link_cache.db")
+LINK_CACHE_TTL_HOURS = float(os.getenv("LINK_CACHE_TTL_HOURS", "168"))
+LINK_CACHE_MAX_ENTRIES = int(os.getenv("LINK_CACHE_MAX_ENTRIES", "5000"))
+# Page rows hold up to LINK_FETCH_MAX_BYTES of HTML each, so keep far fewer
+LINK_PAGE_CACHE_MAX_ENTRIES = int(os.getenv("LINK_PAGE_CACHE_MAX_ENTRIES", "200"))
+
+CACHE_FIELDS = [
+    "title",
+    "description",
+    "site_name",
+    "image_url",
+    "category",
+    "context",
+]
+
+
+class LinkAnalysisCache:
+    """Persistent cache of link analysis results keyed by normalized URL."""
+
+    def __init__(
+        self,
+        db_path: str = LINK_CACHE_PATH,
+        ttl_seconds: float = LINK_CACHE_TTL_HOURS * 3600,
+        max_entries: int = LINK_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.init_db()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS link_cache (
+                    normalized_url TEXT PRIMARY KEY,
+                    title TEXT,
+                    description TEXT,
+                    site_name TEXT,
+                    image_url TEXT,
+                    category TEXT,
+                    context TEXT,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_link_cache_last_used ON link_cache(last_used)"
+            )
+            conn.commit()
+
+    @staticmethod
+    def _key(url: str, namespace: Optional[str]) -> str:
+        # classify_link has no page metadata, so its entries live under their
+        # own prefix instead of shadowing full analyze_link results
+        key = normalize_url(url)
+        return f"{namespace}:{key}" if namespace else key
+
+    def get(self, url: str, namespace: Optional[str] = None) -> Optional[Dict]:
+        key = self._key(url, namespace)
+        now = time.time()
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT * FROM link_cache WHERE normalized_url = ?", (key,)
+            ).fetchone()
+            if row and now - row["created_at"] > self.ttl_seconds:
+                conn.execute("DELETE FROM link_cache WHERE normalized_url = ?", (key,))
+                conn.commit()
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE link_cache SET last_used = ? WHERE normalized_url = ?",
+                (now, key),
+            )
+            conn.commit()
+
+        self.hits += 1
+        return {field: row[field] for field in CACHE_FIELDS}
+
+    def put(self, url: str, entry: Dict, namespace: Optional[str] = None):
+        key = self._key(url, namespace)
+        now = time.time()
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO link_cache (
+                    normalized_url, title, description, site_name, image_url,
+                    category, context, created_at, last_used
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [key]
+                + [entry.get(field) for field in CACHE_FIELDS]
+                + [now, now],
+            )
+            # Evict least recently used entries beyond the size limit
+            conn.execute(
+                """
+                DELETE FROM link_cache WHERE normalized_url IN (
+                    SELECT normalized_url FROM link_cache
+                    ORDER BY last_used DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups * 100) if lookups else 0.0,
+        }
+
+
+class PageCache:
+    """HTTP validators and last fetched HTML per normalized URL.
+
+    Lets the fetcher send If-None-Match / If-Modified-Since and reuse the
+    stored page on a 304. Shares the database file with LinkAnalysisCache.
+    """
+
+    def __init__(
+        self,
+        db_path: str = LINK_CACHE_PATH,
+        max_entries: int = LINK_PAGE_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.init_db()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS page_cache (
+                    normalized_url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    html TEXT NOT NULL,
+                    has_text INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_page_cache_last_used ON page_cache(last_used)"
+            )
+            conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        key = normalize_url(url)
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT * FROM page_cache WHERE normalized_url = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                "UPDATE page_cache SET last_used = ? WHERE normalized_url = ?",
+                (time.time(), key),
+            )
+            conn.commit()
+        return {
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "html": row["html"],
+            "has_text": bool(row["has_text"]),
+        }
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        html: str,
+        has_text: bool,
+    ):
+        key = normalize_url(url)
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO page_cache (
+                    normalized_url, etag, last_modified, html, has_text, last_used
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, etag, last_modified, html, int(has_text), time.time()),
+            )
+            conn.execute(
+                """
+                DELETE FROM page_cache WHERE normalized_url IN (
+                    SELECT normalized_url FROM page_cache
+                    ORDER BY last_used DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            conn.commit()
+
+
+_link_cache: Optional[LinkAnalysisCache] = None
+_link_cache_lock = threading.Lock()
+_page_cache: Optional[PageCache] = None
+
+
+def get_link_cache() -> LinkAnalysisCache:
+    global _link_cache
+    with _link_cache_lock:
+        if _link_cache is None:
+            _link_cache = LinkAnalysisCache()
+        return _link_cache
+
+
+def get_page_cache() -> PageCache:
+    global _page_cache
+    with _link_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
@@ -1,13 +1,19 @@
+import asyncio
 import json
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from openai import AsyncOpenAI
 from trafilatura import extract as trafilatura_extract
 from trafilatura import extract_metadata as trafilatura_extract_metadata
 
+from utilities.links.cache import get_link_cache
+from utilities.links.rules import get_rule_classifier
+from utilities.llm import LLMClientRegistry, get_llm_registry
 from utilities.links.utils import parse_metadata
 
 LINK_CATEGORIES = [
@@ -26,6 +32,30 @@ LINK_CATEGORIES = [
 METADATA_TEXT_LIMIT = 3000
 CLASSIFICATION_TEXT_LIMIT = 1500
 
+# Ask for metadata and classification in one completion instead of two
+LINK_LLM_SINGLE_CALL = os.getenv("LINK_LLM_SINGLE_CALL", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Cache prefix for classify_link results, which carry no page metadata
+CLASSIFY_NAMESPACE = "classify"
+
+# Links per request in analyze_links
+LINK_LLM_BATCH_SIZE = int(os.getenv("LINK_LLM_BATCH_SIZE", "8"))
+
+# Batched requests and the per-link calls they replaced, kept apart from the
+# rule classifier's own savings
+_batch_stats = {"batches": 0, "links": 0, "llm_calls_saved": 0}
+
+# Worker processes for HTML extraction; 0 runs it inline on the event loop
+LINK_EXTRACT_WORKERS = int(os.getenv("LINK_EXTRACT_WORKERS", "2"))
+
+_extract_workers = LINK_EXTRACT_WORKERS
+_extract_executor: Optional[ProcessPoolExecutor] = None
+_extract_semaphore = asyncio.Semaphore(max(LINK_EXTRACT_WORKERS, 1) * 2)
+
 METADATA_PROMPT = """You generate clean, compact link metadata.
 Return JSON only with keys: title, description, site_name.
 Rules:
@@ -55,6 +85,46 @@ Site name: {site_name}
 Content excerpt: {text_excerpt}
 """
 
+ANALYSIS_PROMPT = """You generate clean link metadata, classify the link and summarize it.
+Return JSON only with keys: title, description, site_name, category, context.
+Rules:
+- title: concise, <= 120 chars, no trailing site name unless part of the title.
+- description: 1-2 sentences, <= 240 chars.
+- site_name: short publisher/product name.
+- category: one of code, documentation, video, article, social, news, tool, design, learning, other.
+- context: 1-2 sentences on what the link contains and why it might be useful.
+- If unsure, return null for title, description, site_name or context.
+
+URL: {url}
+Domain: {domain}
+Raw title: {raw_title}
+Raw description: {raw_description}
+Raw site name: {raw_site}
+Extracted text: {text_excerpt}
+"""
+
+BATCH_ANALYSIS_PROMPT = """You generate clean metadata for several links, classify and summarize each.
+Return JSON only: {{"links": [...]}} with one object per link, keys: index, title, description, site_name, category, context.
+Rules:
+- index: the number in brackets before the link.
+- title: concise, <= 120 chars, no trailing site name unless part of the title.
+- description: 1-2 sentences, <= 240 chars.
+- site_name: short publisher/product name.
+- category: one of code, documentation, video, article, social, news, tool, design, learning, other.
+- context: 1-2 sentences on what the link contains and why it might be useful.
+- If unsure, return null for title, description, site_name or context.
+
+{links}"""
+
+BATCH_LINK_TEMPLATE = """[{index}]
+URL: {url}
+Domain: {domain}
+Raw title: {raw_title}
+Raw description: {raw_description}
+Raw site name: {raw_site}
+Extracted text: {text_excerpt}
+"""
+
 
 @dataclass(frozen=True)
 class LinkMetadata:
@@ -64,26 +134,11 @@ class LinkMetadata:
     image_url: Optional[str] = None
 
 
-def _build_classifier_client() -> Tuple[Optional[AsyncOpenAI], str]:
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
+def _build_classifier_client() -> Tuple[Optional[LLMClientRegistry], str]:
+    registry = get_llm_registry()
+    if not registry.configured:
         return None, ""
-
-    base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
-    model = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
-    headers = {}
-    referer = os.getenv("OPENROUTER_HTTP_REFERER")
-    if referer:
-        headers["HTTP-Referer"] = referer
-    title = os.getenv("OPENROUTER_APP_TITLE")
-    if title:
-        headers["X-Title"] = title
-
-    client_kwargs = {"api_key": api_key, "base_url": base_url}
-    if headers:
-        client_kwargs["default_headers"] = headers
-
-    return AsyncOpenAI(**client_kwargs), model
+    return registry, registry.default_model
 
 
 def _clean_value(value: Optional[str]) -> Optional[str]:
@@ -179,8 +234,63 @@ def _extract_raw_metadata(
     )
 
 
+def configure_extract_executor(workers: int) -> None:
+    global _extract_workers, _extract_semaphore
+    shutdown_extract_executor()
+    _extract_workers = max(workers, 0)
+    _extract_semaphore = asyncio.Semaphore(max(_extract_workers, 1) * 2)
+
+
+def shutdown_extract_executor() -> None:
+    global _extract_executor
+    if _extract_executor is not None:
+        _extract_executor.shutdown(wait=False, cancel_futures=True)
+        _extract_executor = None
+
+
+def _get_extract_executor() -> Optional[ProcessPoolExecutor]:
+    global _extract_executor
+    if _extract_workers <= 0:
+        return None
+    if _extract_executor is None:
+        # Forking a process that already runs aiohttp and flush threads can
+        # deadlock; bot.py keeps its startup under a __main__ guard instead
+        method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        _extract_executor = ProcessPoolExecutor(
+            max_workers=_extract_workers,
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _extract_executor
+
+
+async def _run_extraction(
+    html: Optional[str],
+    url: str,
+) -> Tuple[LinkMetadata, Optional[str]]:
+    if not html:
+        return LinkMetadata(), None
+    executor = _get_extract_executor()
+    if executor is None:
+        return _extract_raw_metadata(html, url)
+
+    # The semaphore bounds queued pages so a burst can't pile up HTML in memory
+    async with _extract_semaphore:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor, _extract_raw_metadata, html, url
+            )
+        except BrokenProcessPool:
+            shutdown_extract_executor()
+            return _extract_raw_metadata(html, url)
+
+
 async def _generate_metadata_with_llm(
-    client: Optional[AsyncOpenAI],
+    client: Optional[LLMClientRegistry],
     model: str,
     url: str,
     domain: str,
@@ -199,7 +309,7 @@ async def _generate_metadata_with_llm(
         text_excerpt=_truncate(text, METADATA_TEXT_LIMIT) or "None",
     )
     try:
-        response = await client.chat.completions.create(
+        response = await client.complete(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=220,
@@ -220,7 +330,7 @@ async def _generate_metadata_with_llm(
 
 
 async def _classify_with_llm(
-    client: Optional[AsyncOpenAI],
+    client: Optional[LLMClientRegistry],
     model: str,
     url: str,
     domain: str,
@@ -239,7 +349,7 @@ async def _classify_with_llm(
         text_excerpt=_truncate(text, CLASSIFICATION_TEXT_LIMIT) or "None",
     )
     try:
-        response = await client.chat.completions.create(
+        response = await client.complete(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=180,
@@ -257,13 +367,213 @@ async def _classify_with_llm(
         return "other", None
 
 
-async def analyze_link(
+async def _analyze_with_llm(
+    client: Optional[LLMClientRegistry],
+    model: str,
     url: str,
     domain: str,
-    html: Optional[str],
+    raw: LinkMetadata,
+    text: Optional[str],
+    category: Optional[str] = None,
+) -> Optional[Tuple[LinkMetadata, str, Optional[str]]]:
+    """Single-call metadata + classification; None when the reply is unusable.
+
+    A category passed in (from a rule) replaces the model's answer.
+    """
+    if not client:
+        return None
+
+    prompt = ANALYSIS_PROMPT.format(
+        url=url,
+        domain=domain or "",
+        raw_title=raw.title or "None",
+        raw_description=raw.description or "None",
+        raw_site=raw.site_name or "None",
+        text_excerpt=_truncate(text, METADATA_TEXT_LIMIT) or "None",
+    )
+    try:
+        response = await client.complete(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=400,
+            temperature=0,
+        )
+        payload = _parse_json_payload(response.choices[0].message.content.strip())
+    except Exception:
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    if category is None:
+        category = str(payload.get("category") or "").strip().lower()
+        if category not in LINK_CATEGORIES:
+            return None
+    llm_meta = LinkMetadata(
+        title=_clean_value(payload.get("title")),
+        description=_clean_value(payload.get("description")),
+        site_name=_clean_value(payload.get("site_name")),
+        image_url=None,
+    )
+    return _merge_metadata(llm_meta, raw), category, _clean_value(payload.get("context"))
+
+
+async def _analyze_batch_with_llm(
+    client: Optional[LLMClientRegistry],
+    model: str,
+    items: List[Tuple[str, str, LinkMetadata, Optional[str]]],
+) -> List[Optional[Tuple[LinkMetadata, str, Optional[str]]]]:
+    """One completion for several links; None for each item left unanswered."""
+    results: List[Optional[Tuple[LinkMetadata, str, Optional[str]]]] = [None] * len(
+        items
+    )
+    if not client or not items:
+        return results
+
+    blocks = "\n".join(
+        BATCH_LINK_TEMPLATE.format(
+            index=index,
+            url=url,
+            domain=domain or "",
+            raw_title=raw.title or "None",
+            raw_description=raw.description or "None",
+            raw_site=raw.site_name or "None",
+            text_excerpt=_truncate(text, CLASSIFICATION_TEXT_LIMIT) or "None",
+        )
+        for index, (url, domain, raw, text) in enumerate(items)
+    )
+    try:
+        response = await client.complete(
+            model=model,
+            messages=[
+                {"role": "user", "content": BATCH_ANALYSIS_PROMPT.format(links=blocks)}
+            ],
+            max_tokens=300 * len(items) + 100,
+            temperature=0,
+        )
+        payload = _parse_json_payload(response.choices[0].message.content.strip())
+    except Exception:
+        return results
+
+    entries = payload.get("links") if isinstance(payload, dict) else payload
+    if not isinstance(entries, list):
+        return results
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index")
+        if isinstance(index, bool) or not isinstance(index, int):
+            continue
+        if not 0 <= index < len(items) or results[index] is not None:
+            continue
+        category = str(entry.get("category") or "").strip().lower()
+        if category not in LINK_CATEGORIES:
+            continue
+        llm_meta = LinkMetadata(
+            title=_clean_value(entry.get("title")),
+            description=_clean_value(entry.get("description")),
+            site_name=_clean_value(entry.get("site_name")),
+            image_url=None,
+        )
+        results[index] = (
+            _merge_metadata(llm_meta, items[index][2]),
+            category,
+            _clean_value(entry.get("context")),
+        )
+    return results
+
+
+def get_batch_stats() -> Dict[str, int]:
+    return dict(_batch_stats)
+
+
+async def get_cached_analysis(
+    url: str,
+    namespace: Optional[str] = None,
+) -> Optional[Tuple[LinkMetadata, str, Optional[str]]]:
+    # The lookup also commits an LRU touch, so keep it off the event loop
+    try:
+        entry = await asyncio.to_thread(get_link_cache().get, url, namespace)
+    except Exception:
+        return None
+    if not entry:
+        return None
+    metadata = LinkMetadata(
+        title=entry["title"],
+        description=entry["description"],
+        site_name=entry["site_name"],
+        image_url=entry["image_url"],
+    )
+    return metadata, entry["category"] or "other", entry["context"]
+
+
+async def _store_analysis(
+    url: str,
+    metadata: LinkMetadata,
+    category: str,
+    context: Optional[str],
+    namespace: Optional[str] = None,
+) -> None:
+    # A missing context is also what a failed LLM call returns, so skip it
+    if not context:
+        return
+    try:
+        await asyncio.to_thread(
+            get_link_cache().put,
+            url,
+            {
+                "title": metadata.title,
+                "description": metadata.description,
+                "site_name": metadata.site_name,
+                "image_url": metadata.image_url,
+                "category": category,
+                "context": context,
+            },
+            namespace,
+        )
+    except Exception:
+        pass
+
+
+async def _analyze_extracted(
+    client: Optional[LLMClientRegistry],
+    model: str,
+    url: str,
+    domain: str,
+    raw_meta: LinkMetadata,
+    text: Optional[str],
+    rule_category: Optional[str],
 ) -> Tuple[LinkMetadata, str, Optional[str]]:
-    raw_meta, text = _extract_raw_metadata(html, url)
-    client, model = _build_classifier_client()
+    if rule_category:
+        # The rule settles the category, so one call covers metadata and context
+        analysis = await _analyze_with_llm(
+            client=client,
+            model=model,
+            url=url,
+            domain=domain,
+            raw=raw_meta,
+            text=text,
+            category=rule_category,
+        )
+        if not analysis:
+            return raw_meta, rule_category, None
+        if not LINK_LLM_SINGLE_CALL:
+            get_rule_classifier().llm_calls_saved += 1
+        await _store_analysis(url, *analysis)
+        return analysis
+
+    if LINK_LLM_SINGLE_CALL:
+        merged = await _analyze_with_llm(
+            client=client,
+            model=model,
+            url=url,
+            domain=domain,
+            raw=raw_meta,
+            text=text,
+        )
+        if merged:
+            await _store_analysis(url, *merged)
+            return merged
+
     llm_meta = await _generate_metadata_with_llm(
         client=client,
         model=model,
@@ -280,9 +590,119 @@ async def analyze_link(
         metadata=llm_meta,
         text=text,
     )
+    await _store_analysis(url, llm_meta, category, context)
     return llm_meta, category, context
 
 
+async def analyze_link(
+    url: str,
+    domain: str,
+    html: Optional[str],
+    use_cache: bool = True,
+) -> Tuple[LinkMetadata, str, Optional[str]]:
+    if use_cache:
+        cached = await get_cached_analysis(url)
+        if cached:
+            return cached
+
+    raw_meta, text = await _run_extraction(html, url)
+    client, model = _build_classifier_client()
+    return await _analyze_extracted(
+        client=client,
+        model=model,
+        url=url,
+        domain=domain,
+        raw_meta=raw_meta,
+        text=text,
+        rule_category=get_rule_classifier().classify(url),
+    )
+
+
+async def analyze_links(
+    links: List[Tuple[str, str, Optional[str]]],
+    use_cache: bool = True,
+) -> List[Tuple[LinkMetadata, str, Optional[str]]]:
+    """Analyze (url, domain, html) tuples, LINK_LLM_BATCH_SIZE per LLM request.
+
+    Results come back in input order. Links missing from the batched reply or
+    with an invalid entry fall back to the per-link analyze_link path.
+    """
+    if len(links) == 1:
+        url, domain, html = links[0]
+        return [await analyze_link(url, domain, html, use_cache=use_cache)]
+
+    results: List[Optional[Tuple[LinkMetadata, str, Optional[str]]]] = [None] * len(
+        links
+    )
+    pending = []
+    for index, (url, _, _) in enumerate(links):
+        cached = await get_cached_analysis(url) if use_cache else None
+        if cached:
+            results[index] = cached
+        else:
+            pending.append(index)
+
+    extracted = await asyncio.gather(
+        *(_run_extraction(links[index][2], links[index][0]) for index in pending)
+    )
+    extracted_by_index = dict(zip(pending, extracted))
+    rules = get_rule_classifier()
+    rule_categories = {index: rules.classify(links[index][0]) for index in pending}
+    client, model = _build_classifier_client()
+
+    for start in range(0, len(pending), max(LINK_LLM_BATCH_SIZE, 1)):
+        chunk = pending[start : start + max(LINK_LLM_BATCH_SIZE, 1)]
+        batch = await _analyze_batch_with_llm(
+            client=client,
+            model=model,
+            items=[
+                (links[index][0], links[index][1], *extracted_by_index[index])
+                for index in chunk
+            ],
+        )
+        fallbacks = []
+        for index, analysis in zip(chunk, batch):
+            if analysis is None:
+                fallbacks.append(index)
+                continue
+            metadata, category, context = analysis
+            # A confident rule wins over the model, as in analyze_link
+            category = rule_categories[index] or category
+            results[index] = (metadata, category, context)
+            await _store_analysis(links[index][0], metadata, category, context)
+        # The per-link path spends one call on a rule hit (or in single-call
+        # mode) and two otherwise; the whole chunk cost one
+        answered = [index for index in chunk if index not in fallbacks]
+        if client:
+            _batch_stats["batches"] += 1
+        if answered:
+            per_link_calls = sum(
+                1 if LINK_LLM_SINGLE_CALL or rule_categories[index] else 2
+                for index in answered
+            )
+            _batch_stats["links"] += len(answered)
+            _batch_stats["llm_calls_saved"] += per_link_calls - 1
+
+        fallback_results = await asyncio.gather(
+            *(
+                _analyze_extracted(
+                    client=client,
+                    model=model,
+                    url=links[index][0],
+                    domain=links[index][1],
+                    raw_meta=extracted_by_index[index][0],
+                    text=extracted_by_index[index][1],
+                    rule_category=rule_categories[index],
+                )
+                for index in fallbacks
+            )
+        )
+        for index, analysis in zip(fallbacks, fallback_results):
+            results[index] = analysis
+
+    return results
+
+
 async def classify_link(
     url: str,
     domain: str,
@@ -290,14 +710,22 @@ async def classify_link(
     description: Optional[str] = None,
     site_name: Optional[str] = None,
     text: Optional[str] = None,
+    use_cache: bool = True,
 ):
+    if use_cache:
+        cached = await get_cached_analysis(url) or await get_cached_analysis(
+            url, CLASSIFY_NAMESPACE
+        )
+        if cached:
+            return cached[1], cached[2]
+
     client, model = _build_classifier_client()
     metadata = LinkMetadata(
         title=_clean_value(title),
         description=_clean_value(description),
         site_name=_clean_value(site_name),
     )
-    return await _classify_with_llm(
+    category, context = await _classify_with_llm(
         client=client,
         model=model,
         url=url,
@@ -305,3 +733,9 @@ async def classify_link(
         metadata=metadata,
         text=_clean_value(text),
     )
+    # The context still needs the call; a confident rule only fixes the category
+    category = get_rule_classifier().classify(url) or category
+    await _store_analysis(
+        url, metadata, category, context, namespace=CLASSIFY_NAMESPACE
+    )
+    return category, context
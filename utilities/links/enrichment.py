@@ -0,0 +1,137 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from utilities.links.classifier import LinkMetadata, analyze_links, get_cached_analysis
+from utilities.links.fetcher import LinkFetcher
+from utilities.links.rules import get_rule_classifier
+from utilities.llm import get_llm_registry
+
+LinkJob = Tuple[int, str, str]
+EnrichmentHandler = Callable[[List[LinkJob]], Awaitable[None]]
+
+
+async def enrich_links(
+    db,
+    fetcher: LinkFetcher,
+    links: List[LinkJob],
+    use_cache: bool = True,
+) -> Dict[int, Tuple[LinkMetadata, str, Optional[str]]]:
+    """Fetch, analyze and store metadata for (link_id, url, domain) tuples."""
+    results = {}
+    to_analyze = []
+    for link_id, url, domain in links:
+        # Reposts of an already analyzed URL skip both the fetch and the LLM
+        cached = await get_cached_analysis(url) if use_cache else None
+        if cached:
+            results[link_id] = cached
+        else:
+            to_analyze.append((link_id, url, domain))
+
+    if to_analyze:
+        # Page text only matters when an LLM will read it, and a link a rule
+        # already settles gets its context from the head metadata alone
+        llm_configured = get_llm_registry().configured
+        rules = get_rule_classifier()
+        pages = await asyncio.gather(
+            *(
+                fetcher.fetch(url, need_text=llm_configured and not rules.settles(url))
+                for _, url, _ in to_analyze
+            )
+        )
+        analyses = await analyze_links(
+            [(url, domain, html) for (_, url, domain), html in zip(to_analyze, pages)],
+            use_cache=False,
+        )
+        for (link_id, _, _), analysis in zip(to_analyze, analyses):
+            results[link_id] = analysis
+
+    for link_id, (metadata, category, context) in results.items():
+        db.update_metadata(
+            link_id,
+            metadata.title,
+            metadata.description,
+            metadata.site_name,
+            metadata.image_url,
+            category,
+            context,
+        )
+    return results
+
+
+class EnrichmentQueue:
+    """Bounded queue of links waiting for metadata, drained by N workers.
+
+    Each job is a group of (link_id, url, domain) tuples handled together, so
+    links posted in one message can share a batched LLM request. enqueue()
+    blocks once max_size jobs are waiting, which pushes back on whoever is
+    producing links instead of piling up unbounded tasks. The queue itself
+    is not persisted: links still lacking a title and category in the store
+    are the durable backlog and get re-enqueued on startup.
+    """
+
+    def __init__(
+        self,
+        handler: EnrichmentHandler,
+        workers: int = 3,
+        max_size: int = 100,
+    ):
+        self._handler = handler
+        self._worker_count = max(workers, 1)
+        self._queue: asyncio.Queue[List[LinkJob]] = asyncio.Queue(
+            maxsize=max(max_size, 1)
+        )
+        self._workers: List[asyncio.Task] = []
+        self._pending_ids: Set[int] = set()
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending_ids)
+
+    def start(self):
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self._worker_count)
+        ]
+
+    def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+
+    async def enqueue(self, link_id: int, url: str, domain: str) -> bool:
+        return await self.enqueue_many([(link_id, url, domain)]) > 0
+
+    async def enqueue_many(self, links: List[LinkJob]) -> int:
+        job = [link for link in links if link[0] not in self._pending_ids]
+        if not job:
+            return 0
+        self._pending_ids.update(link[0] for link in job)
+        self.start()
+        await self._queue.put(job)
+        return len(job)
+
+    async def join(self, timeout: Optional[float] = None):
+        await asyncio.wait_for(self._queue.join(), timeout)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            ids = [link[0] for link in job]
+            try:
+                await self._handler(job)
+                self.processed += len(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += len(job)
+                print(f"[LinkEnrichment] Failed to enrich links {ids}: {e}")
+            finally:
+                self._pending_ids.difference_update(ids)
+                self._queue.task_done()
@@ -0,0 +1,134 @@
+"""Sharded static export of saved links for the links website.
+
+Links are written to one JSON shard per month of created_at, next to a
+manifest listing the shards and a prebuilt search index mapping tokens to
+links. Files are only rewritten when their content changes, so a git commit
+of the export directory touches just the shards that actually changed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+from utilities.databases.link_search import SEARCH_FIELDS, tokenize
+
+MANIFEST_FILE = "manifest.json"
+SEARCH_INDEX_FILE = "search-index.json"
+SHARDS_DIR = "shards"
+EXPORT_FIELDS = [
+    "id",
+    "url",
+    "title",
+    "description",
+    "site_name",
+    "image_url",
+    "context",
+    "category",
+    "domain",
+    "created_at",
+    "message_link",
+]
+
+
+def _shard_key(link: Dict) -> str:
+    created_at = link.get("created_at") or ""
+    return created_at[:7] if len(created_at) >= 7 else "unknown"
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def _write_if_changed(path: str, content: bytes) -> bool:
+    try:
+        with open(path, "rb") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def build_export(links: List[Dict]) -> Dict[str, bytes]:
+    """Return {relative path: file content} for the whole export."""
+    ordered = sorted(
+        links,
+        key=lambda link: (link.get("created_at") or "", link["id"]),
+        reverse=True,
+    )
+    shards: Dict[str, List[Dict]] = {}
+    for link in ordered:
+        shards.setdefault(_shard_key(link), []).append(
+            {field: link.get(field) for field in EXPORT_FIELDS}
+        )
+    shard_keys = sorted(shards, reverse=True)
+
+    files: Dict[str, bytes] = {}
+    manifest_shards = []
+    for key in shard_keys:
+        path = f"{SHARDS_DIR}/{key}.json"
+        files[path] = _dumps({"month": key, "links": shards[key]})
+        manifest_shards.append(
+            {
+                "month": key,
+                "path": path,
+                "count": len(shards[key]),
+                "hash": hashlib.sha1(files[path]).hexdigest()[:12],
+            }
+        )
+
+    # docs maps link id to [shard month, category]; terms map tokens to link
+    # ids, so a new link only touches its own entries instead of shifting all
+    docs: Dict[str, List] = {}
+    terms: Dict[str, List[int]] = {}
+    for link in sorted(ordered, key=lambda link: link["id"]):
+        docs[str(link["id"])] = [_shard_key(link), link.get("category") or ""]
+        tokens = set()
+        for field in SEARCH_FIELDS:
+            tokens.update(tokenize(link.get(field)))
+        for token in tokens:
+            terms.setdefault(token, []).append(link["id"])
+    files[SEARCH_INDEX_FILE] = _dumps(
+        {"docs": docs, "terms": dict(sorted(terms.items()))}
+    )
+
+    files[MANIFEST_FILE] = _dumps(
+        {
+            "version": 2,
+            "total": len(ordered),
+            "shards": manifest_shards,
+            "search_index": {
+                "path": SEARCH_INDEX_FILE,
+                "hash": hashlib.sha1(files[SEARCH_INDEX_FILE]).hexdigest()[:12],
+            },
+        }
+    )
+    return files
+
+
+def write_sharded_export(links: List[Dict], export_dir: str) -> List[str]:
+    """Write the export under export_dir; returns the relative paths changed."""
+    files = build_export(links)
+    changed = [
+        path
+        for path, content in files.items()
+        if _write_if_changed(os.path.join(export_dir, path), content)
+    ]
+
+    # Drop shards for months that no longer have any links
+    shards_dir = os.path.join(export_dir, SHARDS_DIR)
+    if os.path.isdir(shards_dir):
+        for name in os.listdir(shards_dir):
+            path = f"{SHARDS_DIR}/{name}"
+            if name.endswith(".json") and path not in files:
+                os.remove(os.path.join(shards_dir, name))
+                changed.append(path)
+    return changed
@@ -0,0 +1,216 @@
+import asyncio
+import codecs
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from utilities.links.cache import get_page_cache
+from utilities.links.utils import HeadScanner, domain_for_url, normalize_url
+
+LINK_FETCH_MAX_BYTES = int(os.getenv("LINK_FETCH_MAX_BYTES", "200000"))
+LINK_FETCH_CHUNK_BYTES = 16384
+# Stop reading at </head> when the page text isn't needed
+LINK_FETCH_HEAD_ONLY = os.getenv("LINK_FETCH_HEAD_ONLY", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+LINK_FETCH_PER_DOMAIN = int(os.getenv("LINK_FETCH_PER_DOMAIN", "1"))
+LINK_FETCH_NEGATIVE_TTL = float(os.getenv("LINK_FETCH_NEGATIVE_TTL", "300"))
+NEGATIVE_CACHE_MAX_ENTRIES = 1000
+
+
+class LinkFetcher:
+    """Streams HTML pages for link metadata over a shared session.
+
+    Fetches are capped globally and per domain, revalidated with the stored
+    ETag/Last-Modified, and URLs that just timed out or returned an error
+    status are skipped for LINK_FETCH_NEGATIVE_TTL seconds.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 3,
+        per_domain: int = LINK_FETCH_PER_DOMAIN,
+        max_bytes: int = LINK_FETCH_MAX_BYTES,
+        head_only: bool = LINK_FETCH_HEAD_ONLY,
+        negative_ttl: float = LINK_FETCH_NEGATIVE_TTL,
+    ):
+        self.max_bytes = max_bytes
+        self.head_only = head_only
+        self.per_domain = max(per_domain, 1)
+        self.negative_ttl = negative_ttl
+        self._semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        # domain -> [semaphore, fetches using it]; dropped once unused
+        self._domain_slots: Dict[str, List] = {}
+        self._failed: Dict[str, float] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.head_only_hits = 0
+        self.revalidated = 0
+        self.negative_hits = 0
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session and not self._session.closed:
+            return self._session
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={"User-Agent": "NovatraBot/1.0"},
+        )
+        return self._session
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "head_only_hits": self.head_only_hits,
+            "revalidated": self.revalidated,
+            "negative_hits": self.negative_hits,
+        }
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    @asynccontextmanager
+    async def _domain_slot(self, domain: str) -> AsyncIterator[None]:
+        slot = self._domain_slots.get(domain)
+        if slot is None:
+            slot = self._domain_slots[domain] = [
+                asyncio.Semaphore(self.per_domain),
+                0,
+            ]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._domain_slots[domain]
+
+    def _recently_failed(self, key: str) -> bool:
+        expires = self._failed.get(key)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self._failed[key]
+            return False
+        return True
+
+    def _mark_failed(self, key: str):
+        now = time.monotonic()
+        if len(self._failed) >= NEGATIVE_CACHE_MAX_ENTRIES:
+            self._failed = {k: v for k, v in self._failed.items() if v > now}
+        if self.negative_ttl > 0:
+            self._failed[key] = now + self.negative_ttl
+
+    async def _cached_page(self, url: str, need_text: bool) -> Optional[Dict]:
+        try:
+            cached = await asyncio.to_thread(get_page_cache().get, url)
+        except Exception:
+            return None
+        # A page cut off at </head> can't answer a request for the page text
+        if cached and (cached["has_text"] or not need_text):
+            return cached
+        return None
+
+    async def _store_page(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        html: str,
+        has_text: bool,
+    ):
+        if not etag and not last_modified:
+            return
+        try:
+            await asyncio.to_thread(
+                get_page_cache().put, url, etag, last_modified, html, has_text
+            )
+        except Exception:
+            pass
+
+    async def fetch(self, url: str, need_text: bool = True) -> Optional[str]:
+        """Fetch a page's HTML, stopping after <head> when that is enough.
+
+        The body is only read when need_text is set, since the page text
+        feeds the LLM prompt.
+        """
+        key = normalize_url(url)
+        if self._recently_failed(key):
+            self.negative_hits += 1
+            return None
+
+        # Cache reads and writes stay outside the fetch slots and off the loop
+        cached = await self._cached_page(url, need_text)
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        # Wait on the domain first so a slow host can't hold global slots
+        async with self._domain_slot(domain_for_url(url)):
+            async with self._semaphore:
+                try:
+                    session = await self._get_session()
+                    async with session.get(
+                        url, allow_redirects=True, headers=headers
+                    ) as resp:
+                        if resp.status == 304 and cached:
+                            self.revalidated += 1
+                            return cached["html"]
+                        if resp.status >= 400:
+                            self._mark_failed(key)
+                            return None
+                        content_type = resp.headers.get("Content-Type", "")
+                        if "text/html" not in content_type:
+                            return None
+                        etag = resp.headers.get("ETag")
+                        last_modified = resp.headers.get("Last-Modified")
+                        html, has_text = await self._read_html(resp, need_text)
+                except asyncio.TimeoutError:
+                    self._mark_failed(key)
+                    return None
+                except Exception:
+                    return None
+
+        await self._store_page(url, etag, last_modified, html, has_text)
+        return html
+
+    async def _read_html(
+        self,
+        resp: aiohttp.ClientResponse,
+        need_text: bool,
+    ) -> Tuple[str, bool]:
+        charset = resp.charset or "utf-8"
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            charset = "utf-8"
+        decoder = codecs.getincrementaldecoder(charset)(errors="ignore")
+        scanner = HeadScanner()
+        chunks = []
+        received = 0
+        has_text = True
+        async for chunk in resp.content.iter_chunked(LINK_FETCH_CHUNK_BYTES):
+            chunk = chunk[: self.max_bytes - received]
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            chunks.append(text)
+            if received >= self.max_bytes:
+                break
+            # The body feeds trafilatura's text for the LLM prompt, so only a
+            # caller that doesn't need text can stop at </head>
+            if not self.head_only or need_text or scanner.head_done:
+                continue
+            scanner.feed(text)
+            if scanner.head_done:
+                # The body was never read, so there is no page text to reuse
+                self.head_only_hits += 1
+                has_text = False
+                break
+        chunks.append(decoder.decode(b"", final=True))
+        return "".join(chunks), has_text
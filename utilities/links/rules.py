@@ -0,0 +1,173 @@
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Pattern, Tuple
+from urllib.parse import urlparse
+
+# Rules at or above this confidence skip the LLM classification call
+LINK_RULE_CONFIDENCE = float(os.getenv("LINK_RULE_CONFIDENCE", "0.8"))
+
+
+@dataclass(frozen=True)
+class LinkRule:
+    category: str
+    confidence: float
+    hosts: Tuple[str, ...] = ()
+    host_prefixes: Tuple[str, ...] = ()
+    path: Optional[Pattern[str]] = None
+
+    def matches(self, host: str, path: str) -> bool:
+        if self.hosts or self.host_prefixes:
+            host_match = any(
+                host == h or host.endswith(f".{h}") for h in self.hosts
+            ) or any(host.startswith(prefix) for prefix in self.host_prefixes)
+            if not host_match:
+                return False
+        if self.path is not None and not self.path.search(path):
+            return False
+        return True
+
+
+DEFAULT_RULES = [
+    LinkRule(
+        "code",
+        0.95,
+        hosts=("github.com", "gitlab.com", "bitbucket.org", "codeberg.org", "sr.ht"),
+    ),
+    LinkRule(
+        "code",
+        0.85,
+        hosts=("pypi.org", "npmjs.com", "crates.io", "pkg.go.dev", "huggingface.co"),
+    ),
+    LinkRule("code", 0.6, hosts=("stackoverflow.com", "stackexchange.com")),
+    LinkRule(
+        "video",
+        0.95,
+        hosts=("youtube.com", "youtu.be", "vimeo.com", "twitch.tv", "loom.com"),
+    ),
+    LinkRule("documentation", 0.9, host_prefixes=("docs.", "doc.", "devdocs.")),
+    LinkRule(
+        "documentation",
+        0.9,
+        hosts=("readthedocs.io", "readthedocs.org", "developer.mozilla.org"),
+    ),
+    LinkRule(
+        "documentation",
+        0.8,
+        path=re.compile(r"^/(docs?|documentation|api-reference)(/|$)"),
+    ),
+    LinkRule(
+        "social",
+        0.9,
+        hosts=(
+            "twitter.com",
+            "x.com",
+            "reddit.com",
+            "bsky.app",
+            "mastodon.social",
+            "threads.net",
+            "linkedin.com",
+        ),
+    ),
+    LinkRule(
+        "article",
+        0.85,
+        hosts=("medium.com", "dev.to", "substack.com", "hashnode.dev"),
+    ),
+    LinkRule("article", 0.85, hosts=("arxiv.org",)),
+    LinkRule("article", 0.7, path=re.compile(r"^/(blog|posts?|articles?)(/|$)")),
+    LinkRule(
+        "news",
+        0.85,
+        hosts=(
+            "news.ycombinator.com",
+            "bbc.com",
+            "bbc.co.uk",
+            "reuters.com",
+            "theverge.com",
+            "techcrunch.com",
+            "arstechnica.com",
+        ),
+    ),
+    LinkRule("design", 0.9, hosts=("figma.com", "dribbble.com", "behance.net")),
+    LinkRule(
+        "learning",
+        0.9,
+        hosts=(
+            "coursera.org",
+            "udemy.com",
+            "edx.org",
+            "khanacademy.org",
+            "freecodecamp.org",
+            "leetcode.com",
+            "roadmap.sh",
+        ),
+    ),
+]
+
+
+class RuleClassifier:
+    """Deterministic domain/path classifier tried before the LLM."""
+
+    def __init__(
+        self,
+        rules=None,
+        threshold: float = LINK_RULE_CONFIDENCE,
+    ):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.threshold = threshold
+        self.matched = 0
+        self.ambiguous = 0
+        self.llm_calls_saved = 0
+
+    def match(self, url: str) -> Optional[Tuple[str, float]]:
+        parsed = urlparse(url)
+        host = parsed.netloc.lower().split(":", 1)[0]
+        if host.startswith("www."):
+            host = host[4:]
+        path = parsed.path.lower()
+        best = None
+        for rule in self.rules:
+            if rule.matches(host, path) and (
+                best is None or rule.confidence > best.confidence
+            ):
+                best = rule
+        if best is None:
+            return None
+        return best.category, best.confidence
+
+    def classify(self, url: str) -> Optional[str]:
+        """Return a category when a rule is confident enough, else None."""
+        result = self.match(url)
+        if result is None or result[1] < self.threshold:
+            self.ambiguous += 1
+            return None
+        self.matched += 1
+        return result[0]
+
+    def settles(self, url: str) -> bool:
+        """Whether classify() would answer url, without counting it."""
+        result = self.match(url)
+        return result is not None and result[1] >= self.threshold
+
+    def stats(self) -> Dict:
+        total = self.matched + self.ambiguous
+        return {
+            "matched": self.matched,
+            "ambiguous": self.ambiguous,
+            "llm_calls_saved": self.llm_calls_saved,
+            "match_rate": (self.matched / total * 100) if total else 0.0,
+        }
+
+
+_rule_classifier: Optional[RuleClassifier] = None
+_rule_classifier_lock = threading.Lock()
+
+
+def get_rule_classifier() -> RuleClassifier:
+    global _rule_classifier
+    with _rule_classifier_lock:
+        if _rule_classifier is None:
+            _rule_classifier = RuleClassifier()
+        return _rule_classifier
@@ -80,8 +80,12 @@ class _MetadataParser(HTMLParser):
         self._in_title = False
         self._title_chunks: List[str] = []
         self._meta: Dict[str, str] = {}
+        self.head_done = False
 
     def handle_starttag(self, tag: str, attrs: List[tuple]):
+        if tag == "body":
+            self.head_done = True
+            return
         if tag == "title":
             self._in_title = True
             return
@@ -99,6 +103,8 @@ class _MetadataParser(HTMLParser):
     def handle_endtag(self, tag: str):
         if tag == "title":
             self._in_title = False
+        elif tag == "head":
+            self.head_done = True
 
     def handle_data(self, data: str):
         if self._in_title:
@@ -115,7 +121,10 @@ class _MetadataParser(HTMLParser):
 def parse_metadata(html: str) -> Dict[str, Optional[str]]:
     parser = _MetadataParser()
     parser.feed(html)
-    payload = parser.build()
+    return _select_metadata(parser.build())
+
+
+def _select_metadata(payload: Dict) -> Dict[str, Optional[str]]:
     meta = payload["meta"]
     title = (
         meta.get("og:title") or meta.get("twitter:title") or payload["title"] or None
@@ -134,3 +143,18 @@ def parse_metadata(html: str) -> Dict[str, Optional[str]]:
         "site_name": site_name,
         "image_url": image_url,
     }
+
+
+class HeadScanner:
+    """Parses streamed HTML chunks until the end of <head>."""
+
+    def __init__(self) -> None:
+        self._parser = _MetadataParser()
+
+    @property
+    def head_done(self) -> bool:
+        return self._parser.head_done
+
+    def feed(self, chunk: str) -> None:
+        if not self._parser.head_done:
+            self._parser.feed(chunk)
@@ -1,18 +1,39 @@
 import asyncio
 import datetime
 import hashlib
+import json
 import os
 import shutil
 import subprocess
+import time
 
 import discord
 from discord.ext import commands, tasks
 
+from utilities.links.export import write_sharded_export
+
 GITHUB_BRANCH = os.getenv("GITHUB_BRANCH")
 GITHUB_CLONE_URL = os.getenv("GITHUB_CLONE_URL", "https://github.com/NovatraX/links")
 
 GITHUB_SSH_DIR = os.getenv("GITHUB_SSH_DIR", "data/links")
 GITHUB_FILE_PATH = os.getenv("GITHUB_FILE_PATH", "links.json")
+# Sharded export (manifest, search index, monthly shards); index.html reads it
+# from data/ (its DATA_BASE)
+GITHUB_EXPORT_DIR = os.getenv("GITHUB_EXPORT_DIR", "data")
+# Set to false once the website only reads the sharded export
+LINKS_SYNC_FULL_JSON = os.getenv("LINKS_SYNC_FULL_JSON", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# "worktree" copies files into a clone; "plumbing" writes git objects directly
+LINKS_SYNC_MODE = os.getenv("LINKS_SYNC_MODE", "worktree").lower()
+GITHUB_BARE_DIR = os.getenv("GITHUB_BARE_DIR", "data/links.git")
+LINKS_EXPORT_DIR = os.getenv("LINKS_EXPORT_DIR", "data/links_export")
+EMPTY_OBJECT_ID = "0" * 40
+# Push once links have been quiet this long, but never later than the max delay
+LINKS_SYNC_QUIET_SECONDS = float(os.getenv("LINKS_SYNC_QUIET_SECONDS", "60"))
+LINKS_SYNC_MAX_DELAY = float(os.getenv("LINKS_SYNC_MAX_DELAY", "600"))
 
 GITHUB_SSH_KEY_PATH = os.getenv("GITHUB_SSH_KEY_PATH")
 
@@ -30,22 +51,105 @@ class LinksSyncCog(commands.Cog):
         self.last_push_time: datetime.datetime | None = None
         self.last_push_success: bool | None = None
         self._first_sync = True
+        self._plumbing_branch: str | None = None
+        self._exported_revision: int | None = None
+        self._file_stamp: tuple[int, int] | None = None
+        self._file_hash: str | None = None
+        self._links_db = None
+        # Monotonic times of the first and latest unsynced change
+        self._first_change_at: float | None = time.monotonic()
+        self._last_change_at: float | None = self._first_change_at
         self.sync_links.start()
 
     def cog_unload(self):
         self.sync_links.cancel()
+        if self._links_db is not None:
+            self._links_db.remove_change_listener(self._on_links_changed)
+
+    def _on_links_changed(self) -> None:
+        now = time.monotonic()
+        if self._first_change_at is None:
+            self._first_change_at = now
+        self._last_change_at = now
+
+    def _mark_synced(self, changed_at: float | None) -> None:
+        # Keep changes that arrived while the sync was running pending
+        if self._last_change_at == changed_at:
+            self._first_change_at = self._last_change_at = None
+
+    def _pending_enrichment(self) -> int:
+        links_cog = self.bot.get_cog("LinkSaverCog")
+        enrichment = getattr(links_cog, "enrichment", None)
+        return enrichment.pending if enrichment is not None else 0
+
+    def _sync_due(self) -> bool:
+        if self._first_change_at is None:
+            return False
+        now = time.monotonic()
+        if now - self._first_change_at >= LINKS_SYNC_MAX_DELAY:
+            return True
+        if now - self._last_change_at < LINKS_SYNC_QUIET_SECONDS:
+            return False
+        # Hold back until new links have their metadata, so a commit doesn't
+        # publish them half-enriched
+        return self._pending_enrichment() == 0
+
+    def _subscribe_to_links(self) -> None:
+        # With a change signal from the link store, idle ticks skip the disk
+        links_cog = self.bot.get_cog("LinkSaverCog")
+        db = getattr(links_cog, "db", None)
+        if db is self._links_db or not hasattr(db, "add_change_listener"):
+            return
+        if self._links_db is not None:
+            self._links_db.remove_change_listener(self._on_links_changed)
+        db.add_change_listener(self._on_links_changed)
+        self._links_db = db
+        self._on_links_changed()
 
     def _get_file_hash(self) -> str | None:
-        if not os.path.exists(LINKS_JSON_PATH):
+        try:
+            stat = os.stat(LINKS_JSON_PATH)
+        except FileNotFoundError:
             return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._file_stamp and self._file_hash:
+            return self._file_hash
         with open(LINKS_JSON_PATH, "rb") as f:
-            return hashlib.md5(f.read()).hexdigest()
-
-    def _run_git(self, args: list[str], cwd: str | None, env: dict) -> tuple[bool, str]:
+            self._file_hash = hashlib.md5(f.read()).hexdigest()
+        self._file_stamp = stamp
+        return self._file_hash
+
+    def _refresh_links_export(self) -> None:
+        # The SQLite backend keeps links.json as an export for the website
+        links_cog = self.bot.get_cog("LinkSaverCog")
+        db = getattr(links_cog, "db", None)
+        if not hasattr(db, "export_json"):
+            return
+        if db.revision == self._exported_revision:
+            return
+        db.export_json(LINKS_JSON_PATH)
+        self._exported_revision = db.revision
+
+    def _load_links(self) -> list[dict]:
+        links_cog = self.bot.get_cog("LinkSaverCog")
+        db = getattr(links_cog, "db", None)
+        if db is not None:
+            return db.get_all_links()
+        with open(LINKS_JSON_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("links", [])
+
+    def _run_git(
+        self,
+        args: list[str],
+        cwd: str | None,
+        env: dict,
+        input: str | None = None,
+    ) -> tuple[bool, str]:
         result = subprocess.run(
             ["git", *args],
             cwd=cwd,
             env=env,
+            input=input,
             capture_output=True,
             text=True,
         )
@@ -78,13 +182,7 @@ class LinksSyncCog(commands.Cog):
             return origin_head.split("/", 1)[1] if "/" in origin_head else origin_head
         return None
 
-    def _git_push_sync(self):
-        if not shutil.which("git"):
-            return False, "git is not installed on the host"
-
-        if not os.path.exists(LINKS_JSON_PATH):
-            return False, "links.json not found"
-
+    def _git_env(self) -> dict:
         env = os.environ.copy()
         self._ensure_git_identity(env)
         if GITHUB_SSH_KEY_PATH and "GIT_SSH_COMMAND" not in env:
@@ -92,7 +190,19 @@ class LinksSyncCog(commands.Cog):
                 f'ssh -i "{GITHUB_SSH_KEY_PATH}" -o IdentitiesOnly=yes '
                 "-o StrictHostKeyChecking=accept-new"
             )
+        return env
 
+    def _git_push_sync(self):
+        if not shutil.which("git"):
+            return False, "git is not installed on the host"
+
+        if not os.path.exists(LINKS_JSON_PATH):
+            return False, "links.json not found"
+
+        if LINKS_SYNC_MODE == "plumbing":
+            return self._git_plumbing_sync()
+
+        env = self._git_env()
         repo_dir = GITHUB_SSH_DIR
         git_dir = os.path.join(repo_dir, ".git")
         desired_branch = GITHUB_BRANCH
@@ -143,14 +253,25 @@ class LinksSyncCog(commands.Cog):
                     dest.write(content)
             self._first_sync = False
 
-        target_path = os.path.join(repo_dir, GITHUB_FILE_PATH)
-        os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
-        with open(LINKS_JSON_PATH, "rb") as source:
-            content = source.read()
-        with open(target_path, "wb") as dest:
-            dest.write(content)
+        add_paths = []
+        if LINKS_SYNC_FULL_JSON:
+            target_path = os.path.join(repo_dir, GITHUB_FILE_PATH)
+            os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+            with open(LINKS_JSON_PATH, "rb") as source:
+                content = source.read()
+            with open(target_path, "wb") as dest:
+                dest.write(content)
+            add_paths.append(GITHUB_FILE_PATH)
+
+        # Only shards whose content changed are rewritten and staged
+        changed = write_sharded_export(
+            self._load_links(), os.path.join(repo_dir, GITHUB_EXPORT_DIR)
+        )
+        add_paths += [os.path.join(GITHUB_EXPORT_DIR, path) for path in changed]
+        if not add_paths:
+            return True, "No changes to push"
 
-        ok, msg = self._run_git(["add", GITHUB_FILE_PATH], repo_dir, env)
+        ok, msg = self._run_git(["add", "-A", "--", *add_paths], repo_dir, env)
         if not ok:
             return False, f"git add failed: {msg}"
 
@@ -159,7 +280,7 @@ class LinksSyncCog(commands.Cog):
             return True, "No changes to push"
 
         ok, msg = self._run_git(
-            ["commit", "-m", "chore: update links.json"], repo_dir, env
+            ["commit", "-m", "chore: update links export"], repo_dir, env
         )
         if not ok:
             return False, f"git commit failed: {msg}"
@@ -175,15 +296,146 @@ class LinksSyncCog(commands.Cog):
 
         return True, "Success"
 
+    def _prepare_plumbing_repo(self, env: dict) -> tuple[bool, str]:
+        # One-time setup: a persistent bare clone, the branch tip from origin,
+        # links.json restored from it and the sync index seeded with its tree
+        if not os.path.isdir(GITHUB_BARE_DIR):
+            os.makedirs(os.path.dirname(GITHUB_BARE_DIR) or ".", exist_ok=True)
+            ok, msg = self._run_git(
+                ["clone", "--bare", GITHUB_CLONE_URL, GITHUB_BARE_DIR], None, env
+            )
+            if not ok:
+                return False, f"git clone failed: {msg}"
+
+        branch = GITHUB_BRANCH
+        if not branch:
+            ok, head = self._run_git(["symbolic-ref", "--short", "HEAD"], None, env)
+            if not ok or not head:
+                return False, f"could not resolve the default branch: {head}"
+            branch = head
+        self._plumbing_branch = branch
+        ref = f"refs/heads/{branch}"
+
+        ok, msg = self._run_git(["fetch", "origin", f"+{ref}:{ref}"], None, env)
+        has_remote_branch = ok
+        if has_remote_branch:
+            result = subprocess.run(
+                ["git", "cat-file", "blob", f"{ref}:{GITHUB_FILE_PATH}"],
+                env=env,
+                capture_output=True,
+            )
+            if result.returncode == 0:
+                os.makedirs(os.path.dirname(LINKS_JSON_PATH) or ".", exist_ok=True)
+                with open(LINKS_JSON_PATH, "wb") as dest:
+                    dest.write(result.stdout)
+            ok, msg = self._run_git(["read-tree", ref], None, env)
+        else:
+            ok, msg = self._run_git(["read-tree", "--empty"], None, env)
+        if not ok:
+            return False, f"git read-tree failed: {msg}"
+
+        # Rebuild the local export from scratch so every file gets staged
+        if os.path.isdir(LINKS_EXPORT_DIR):
+            shutil.rmtree(LINKS_EXPORT_DIR)
+        self._first_sync = False
+        return True, "Ready"
+
+    def _git_plumbing_sync(self):
+        env = self._git_env()
+        env["GIT_DIR"] = os.path.abspath(GITHUB_BARE_DIR)
+        env["GIT_INDEX_FILE"] = os.path.abspath(
+            os.path.join(GITHUB_BARE_DIR, "links-sync.index")
+        )
+        if self._first_sync:
+            ok, msg = self._prepare_plumbing_repo(env)
+            if not ok:
+                return False, msg
+        ref = f"refs/heads/{self._plumbing_branch}"
+
+        # (source file, path in the repo) pairs to hash, plus paths to drop
+        sources = []
+        if LINKS_SYNC_FULL_JSON:
+            sources.append((LINKS_JSON_PATH, GITHUB_FILE_PATH))
+        removed = []
+        changed = write_sharded_export(self._load_links(), LINKS_EXPORT_DIR)
+        for path in changed:
+            source = os.path.join(LINKS_EXPORT_DIR, path)
+            repo_path = "/".join(p for p in (GITHUB_EXPORT_DIR, path) if p)
+            if os.path.exists(source):
+                sources.append((source, repo_path))
+            else:
+                removed.append(repo_path)
+
+        index_info = [f"0 {EMPTY_OBJECT_ID}\t{path}" for path in removed]
+        if sources:
+            ok, output = self._run_git(
+                ["hash-object", "-w", "--stdin-paths"],
+                None,
+                env,
+                input="\n".join(os.path.abspath(src) for src, _ in sources) + "\n",
+            )
+            if not ok:
+                return False, f"git hash-object failed: {output}"
+            index_info += [
+                f"100644 {object_id}\t{repo_path}"
+                for object_id, (_, repo_path) in zip(output.split(), sources)
+            ]
+        if index_info:
+            ok, msg = self._run_git(
+                ["update-index", "--add", "--index-info"],
+                None,
+                env,
+                input="\n".join(index_info) + "\n",
+            )
+            if not ok:
+                return False, f"git update-index failed: {msg}"
+
+        ok, tree = self._run_git(["write-tree"], None, env)
+        if not ok:
+            return False, f"git write-tree failed: {tree}"
+        ok, parent = self._run_git(["rev-parse", "--verify", "-q", ref], None, env)
+        parent = parent if ok else None
+        if parent:
+            ok, parent_tree = self._run_git(
+                ["rev-parse", f"{parent}^{{tree}}"], None, env
+            )
+            if ok and parent_tree == tree:
+                return True, "No changes to push"
+
+        commit_args = ["commit-tree", tree, "-m", "chore: update links export"]
+        if parent:
+            commit_args += ["-p", parent]
+        ok, commit = self._run_git(commit_args, None, env)
+        if not ok:
+            return False, f"git commit-tree failed: {commit}"
+        # Advance the local ref only once the push landed, so a failed push is
+        # retried with a fresh commit instead of looking like "no changes"
+        ok, msg = self._run_git(
+            ["push", "--force", "origin", f"{commit}:{ref}"], None, env
+        )
+        if not ok:
+            return False, f"git push failed: {msg}"
+        ok, msg = self._run_git(["update-ref", ref, commit], None, env)
+        if not ok:
+            return False, f"git update-ref failed: {msg}"
+        return True, "Success"
+
     async def _git_push(self) -> tuple[bool, str]:
         return await asyncio.to_thread(self._git_push_sync)
 
     async def _sync_once(self, force: bool = False) -> None:
+        self._subscribe_to_links()
+        if not force and self._links_db is not None and not self._sync_due():
+            return
+        changed_at = self._last_change_at
+
+        await asyncio.to_thread(self._refresh_links_export)
         current_hash = self._get_file_hash()
         if current_hash is None:
             return
 
         if not force and self._last_hash == current_hash:
+            self._mark_synced(changed_at)
             return
 
         pushed, msg = await self._git_push()
@@ -193,13 +445,18 @@ class LinksSyncCog(commands.Cog):
 
         if pushed or msg == "No changes to push":
             self._last_hash = current_hash
+            self._mark_synced(changed_at)
+        else:
+            # Retry after another quiet window
+            self._first_change_at = None
+            self._on_links_changed()
 
         if pushed:
             print("[LinkSync] Pushed updated links.json to GitHub")
         else:
             print(f"[LinkSync] Push failed: {msg}")
 
-    @tasks.loop(seconds=30)
+    @tasks.loop(seconds=15)
     async def sync_links(self):
         await self._sync_once()
 
@@ -214,6 +471,8 @@ class LinksSyncCog(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def sync_now(self, ctx: discord.ApplicationContext):
         await ctx.defer()
+        changed_at = self._last_change_at
+        await asyncio.to_thread(self._refresh_links_export)
         current_hash = self._get_file_hash()
         if current_hash is None:
             await ctx.followup.send("❌ links.json not found")
@@ -225,6 +484,7 @@ class LinksSyncCog(commands.Cog):
         self.last_push_success = pushed
         if pushed or msg == "No changes to push":
             self._last_hash = current_hash
+            self._mark_synced(changed_at)
 
         if pushed:
             await ctx.followup.send("✅ Successfully pushed links.json to GitHub")
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "10"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "120"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# e.g. {"openai/gpt-4o-mini": {"timeout": 30, "max_concurrency": 2}}
+LLM_MODEL_SETTINGS = os.getenv("LLM_MODEL_SETTINGS", "")
+
+
+@dataclass(frozen=True)
+class ModelSettings:
+    timeout: Optional[float] = None
+    max_concurrency: Optional[int] = None
+
+
+def _parse_model_settings(raw: str) -> Dict[str, ModelSettings]:
+    if not raw:
+        return {}
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        print("[LLM] Ignoring invalid LLM_MODEL_SETTINGS")
+        return {}
+    settings = {}
+    for model, values in payload.items():
+        if not isinstance(values, dict):
+            continue
+        settings[model] = ModelSettings(
+            timeout=values.get("timeout"),
+            max_concurrency=values.get("max_concurrency"),
+        )
+    return settings
+
+
+class LLMClientRegistry:
+    """Process-wide OpenRouter client with a shared connection pool.
+
+    Every chat completion goes through complete(), which applies the global
+    concurrency limit plus any per-model limit and timeout.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        model_settings: Optional[Dict[str, ModelSettings]] = None,
+    ):
+        self.api_key = os.getenv("OPENROUTER_API_KEY")
+        self.base_url = os.getenv(
+            "OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"
+        )
+        self.default_model = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
+        self.model_settings = model_settings or {}
+        self._semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        self._model_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._client: Optional[AsyncOpenAI] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _default_headers(self) -> Dict[str, str]:
+        headers = {}
+        referer = os.getenv("OPENROUTER_HTTP_REFERER")
+        if referer:
+            headers["HTTP-Referer"] = referer
+        title = os.getenv("OPENROUTER_APP_TITLE")
+        if title:
+            headers["X-Title"] = title
+        return headers
+
+    def get_client(self) -> Optional[AsyncOpenAI]:
+        if not self.configured:
+            return None
+        if self._client is None:
+            client_kwargs = {
+                "api_key": self.api_key,
+                "base_url": self.base_url,
+                "timeout": LLM_TIMEOUT_SECONDS,
+                "http_client": DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=LLM_MAX_CONNECTIONS,
+                        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                        keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+                    )
+                ),
+            }
+            headers = self._default_headers()
+            if headers:
+                client_kwargs["default_headers"] = headers
+            self._client = AsyncOpenAI(**client_kwargs)
+        return self._client
+
+    def settings_for(self, model: str) -> ModelSettings:
+        return self.model_settings.get(model, ModelSettings())
+
+    def _model_semaphore(self, model: str) -> Optional[asyncio.Semaphore]:
+        limit = self.settings_for(model).max_concurrency
+        if not limit:
+            return None
+        semaphore = self._model_semaphores.get(model)
+        if semaphore is None:
+            semaphore = self._model_semaphores[model] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def complete(self, model: Optional[str] = None, **kwargs: Any):
+        client = self.get_client()
+        if client is None:
+            raise RuntimeError("OPENROUTER_API_KEY is not configured")
+
+        model = model or self.default_model
+        settings = self.settings_for(model)
+        if settings.timeout is not None:
+            kwargs.setdefault("timeout", settings.timeout)
+
+        # Wait on the per-model limit first so queued calls for a throttled
+        # model don't hold global slots
+        model_semaphore = self._model_semaphore(model)
+        if model_semaphore is None:
+            return await self._create(client, model, kwargs)
+        async with model_semaphore:
+            return await self._create(client, model, kwargs)
+
+    async def _create(self, client: AsyncOpenAI, model: str, kwargs: Dict[str, Any]):
+        async with self._semaphore:
+            return await client.chat.completions.create(model=model, **kwargs)
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry(
+                model_settings=_parse_model_settings(LLM_MODEL_SETTINGS)
+            )
+        return _registry
@@ -1,13 +1,28 @@
 import datetime
-import json
 import os
 import platform
+import time
+from collections import deque
+from dataclasses import dataclass
 
 import discord
 import psutil
 from discord.ext import commands, tasks
 
-LINKS_JSON_PATH = "data/links.json"
+from utilities.links import get_batch_stats, get_link_cache, get_rule_classifier
+
+STATUS_SAMPLE_SECONDS = float(os.getenv("STATUS_SAMPLE_SECONDS", "10"))
+STATUS_WINDOW_SECONDS = float(os.getenv("STATUS_WINDOW_SECONDS", "300"))
+
+
+@dataclass(frozen=True)
+class SystemSample:
+    taken_at: float
+    cpu: float
+    memory: float
+    disk: float
+    sent_rate: float
+    recv_rate: float
 
 
 class StatusCog(commands.Cog):
@@ -15,15 +30,65 @@ class StatusCog(commands.Cog):
         self.bot = bot
         self.status_channel_id = None
         self.status_message = None
+        self.samples = deque(
+            maxlen=max(int(STATUS_WINDOW_SECONDS / STATUS_SAMPLE_SECONDS), 1)
+        )
+        self._last_net = None
+        # Prime the counter so the first non-blocking reading has a baseline
+        psutil.cpu_percent(interval=None)
+        self.sample_system.start()
         self.update_status.start()
 
+    def cog_unload(self):
+        self.sample_system.cancel()
+        self.update_status.cancel()
+
+    def take_sample(self) -> SystemSample:
+        # cpu_percent(interval=None) compares against the previous call
+        # instead of sleeping, so sampling never blocks the event loop
+        now = time.monotonic()
+        net_io = psutil.net_io_counters()
+        sent_rate = recv_rate = 0.0
+        if self._last_net:
+            last_time, last_io = self._last_net
+            elapsed = max(now - last_time, 1e-6)
+            sent_rate = (net_io.bytes_sent - last_io.bytes_sent) / elapsed
+            recv_rate = (net_io.bytes_recv - last_io.bytes_recv) / elapsed
+        self._last_net = (now, net_io)
+
+        sample = SystemSample(
+            taken_at=now,
+            cpu=psutil.cpu_percent(interval=None),
+            memory=psutil.virtual_memory().percent,
+            disk=psutil.disk_usage("/").percent,
+            sent_rate=max(sent_rate, 0.0),
+            recv_rate=max(recv_rate, 0.0),
+        )
+        self.samples.append(sample)
+        return sample
+
+    @tasks.loop(seconds=STATUS_SAMPLE_SECONDS)
+    async def sample_system(self):
+        self.take_sample()
+
+    def get_trend(self, field: str) -> dict:
+        values = [getattr(sample, field) for sample in self.samples]
+        if not values:
+            return {"min": 0.0, "avg": 0.0, "max": 0.0}
+        return {
+            "min": min(values),
+            "avg": sum(values) / len(values),
+            "max": max(values),
+        }
+
     def get_system_info(self):
         # Basic System Info
         system = platform.system()
         release = platform.release()
 
+        latest = self.samples[-1] if self.samples else self.take_sample()
+
         # CPU Info
-        cpu_usage = psutil.cpu_percent(interval=1)
         cpu_count = psutil.cpu_count(logical=True)
         cpu_freq = psutil.cpu_freq()
 
@@ -43,15 +108,27 @@ class StatusCog(commands.Cog):
         return {
             "system": system,
             "release": release,
-            "cpu_usage": cpu_usage,
+            "cpu_usage": latest.cpu,
             "cpu_count": cpu_count,
             "cpu_freq": cpu_freq,
             "memory": memory,
             "disk": disk,
             "uptime": uptime,
             "net_io": net_io,
+            "sent_rate": latest.sent_rate,
+            "recv_rate": latest.recv_rate,
+            "trends": {
+                field: self.get_trend(field)
+                for field in ("cpu", "memory", "disk", "sent_rate", "recv_rate")
+            },
+            "window": len(self.samples) * STATUS_SAMPLE_SECONDS,
         }
 
+    def format_trend(self, trend: dict, unit: str = "%") -> str:
+        return (
+            f"{trend['min']:.1f} / {trend['avg']:.1f} / {trend['max']:.1f} {unit}"
+        )
+
     def format_bytes(self, bytes):
         for unit in ["B", "KB", "MB", "GB", "TB"]:
             if bytes < 1024:
@@ -73,34 +150,37 @@ class StatusCog(commands.Cog):
         return color * filled + "⬜" * empty
 
     def get_links_info(self):
-        if not os.path.exists(LINKS_JSON_PATH):
+        # Counters are maintained by the link store on every save, so this
+        # never has to read or parse the whole links file
+        link_cog = self.bot.get_cog("LinkSaverCog")
+        if not link_cog:
             return {"exists": False}
 
         try:
-            stat = os.stat(LINKS_JSON_PATH)
-            with open(LINKS_JSON_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            links = data.get("links", [])
-            categories = {}
-            for link in links:
-                cat = link.get("category") or "uncategorized"
-                categories[cat] = categories.get(cat, 0) + 1
-
-            return {
-                "exists": True,
-                "count": len(links),
-                "size": stat.st_size,
-                "modified": datetime.datetime.fromtimestamp(stat.st_mtime),
-                "categories": categories,
-            }
+            stats = link_cog.db.get_stats()
+            stat = os.stat(link_cog.db.db_path)
         except Exception:
             return {"exists": False}
 
+        return {
+            "exists": True,
+            "count": stats["total"],
+            "size": stat.st_size,
+            "modified": datetime.datetime.fromtimestamp(stat.st_mtime),
+            "categories": stats["categories"],
+            "domains": stats["domains"],
+        }
+
     def get_services_info(self):
+        link_cog = self.bot.get_cog("LinkSaverCog")
+        fetcher = getattr(link_cog, "fetcher", None)
         return {
             "openrouter_model": os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini"),
             "openrouter_configured": bool(os.getenv("OPENROUTER_API_KEY")),
+            "link_cache": get_link_cache().stats(),
+            "link_rules": get_rule_classifier().stats(),
+            "link_batches": get_batch_stats(),
+            "link_fetches": fetcher.stats() if fetcher else None,
         }
 
     def get_github_sync_status(self):
@@ -132,10 +212,18 @@ class StatusCog(commands.Cog):
         cpu_freq_current = info["cpu_freq"].current if info["cpu_freq"] else "N/A"
         cpu_bar = self.create_progress_bar(info["cpu_usage"])
 
+        trends = info["trends"]
+        window = (
+            f"{info['window'] / 60:.0f}m"
+            if info["window"] >= 60
+            else f"{info['window']:.0f}s"
+        )
+
         embed.add_field(
             name="🧠 CPU",
             value=(
-                f"Usage : {cpu_bar} {info['cpu_usage']} %\n\n"
+                f"Usage : {cpu_bar} {info['cpu_usage']} %\n"
+                f"Min / Avg / Max ({window}) : {self.format_trend(trends['cpu'])}\n\n"
                 f"**Cores** : {info['cpu_count']}\n"
                 f"Frequency : {cpu_freq_current:.2f} MHz"
                 if cpu_freq_current != "N/A"
@@ -147,7 +235,8 @@ class StatusCog(commands.Cog):
         memory_bar = self.create_progress_bar(info["memory"].percent)
         embed.add_field(
             name="💾 Memory",
-            value=f"**Usage** : {memory_bar} {info['memory'].percent} %\n\n"
+            value=f"**Usage** : {memory_bar} {info['memory'].percent} %\n"
+            f"Min / Avg / Max ({window}) : {self.format_trend(trends['memory'])}\n\n"
             f"Total : {self.format_bytes(info['memory'].total)}\n"
             f"Available : {self.format_bytes(info['memory'].available)}",
             inline=False,
@@ -156,7 +245,8 @@ class StatusCog(commands.Cog):
         disk_bar = self.create_progress_bar(info["disk"].percent)
         embed.add_field(
             name="💿 Disk",
-            value=f"**Usage** : {disk_bar} {info['disk'].percent} %\n\n"
+            value=f"**Usage** : {disk_bar} {info['disk'].percent} %\n"
+            f"Min / Avg / Max ({window}) : {self.format_trend(trends['disk'])}\n\n"
             f"Total : {self.format_bytes(info['disk'].total)}\n"
             f"Free : {self.format_bytes(info['disk'].free)}",
             inline=False,
@@ -164,8 +254,12 @@ class StatusCog(commands.Cog):
 
         embed.add_field(
             name="🌐 Network",
-            value=f"Sent : {self.format_bytes(info['net_io'].bytes_sent)}\n"
-            f"Received : {self.format_bytes(info['net_io'].bytes_recv)}",
+            value=f"Sent : {self.format_bytes(info['net_io'].bytes_sent)} "
+            f"({self.format_bytes(info['sent_rate'])}/s, "
+            f"max {self.format_bytes(trends['sent_rate']['max'])}/s)\n"
+            f"Received : {self.format_bytes(info['net_io'].bytes_recv)} "
+            f"({self.format_bytes(info['recv_rate'])}/s, "
+            f"max {self.format_bytes(trends['recv_rate']['max'])}/s)",
             inline=False,
         )
 
@@ -175,10 +269,18 @@ class StatusCog(commands.Cog):
 
         if links_info.get("exists"):
             last_mod_ts = int(links_info["modified"].timestamp())
+            top_categories = ", ".join(
+                f"{name} ({count})"
+                for name, count in sorted(
+                    links_info["categories"].items(), key=lambda item: -item[1]
+                )[:3]
+            )
 
             embed.add_field(
                 name="🔗 Links Database",
-                value=f"**Total** : {links_info['count']} links\n\n"
+                value=f"**Total** : {links_info['count']} links\n"
+                f"Top Categories : {top_categories or 'None'}\n"
+                f"Domains : {len(links_info['domains'])}\n\n"
                 f"Modified : <t:{last_mod_ts}:f>\n"
                 f"Sync : {sync_status}",
                 inline=False,
@@ -193,10 +295,27 @@ class StatusCog(commands.Cog):
         openrouter_status = (
             "Configured" if services_info["openrouter_configured"] else "Not Configured"
         )
+        link_cache = services_info["link_cache"]
+        link_rules = services_info["link_rules"]
+        link_batches = services_info["link_batches"]
+        link_fetches = services_info["link_fetches"]
+        fetch_line = (
+            f"Link Fetches : {link_fetches['head_only_hits']} head-only / "
+            f"{link_fetches['revalidated']} revalidated / "
+            f"{link_fetches['negative_hits']} skipped\n"
+            if link_fetches
+            else ""
+        )
         embed.add_field(
             name="⚙️ Services",
             value=f"**OpenRouter** : {openrouter_status}\n"
-            f"Model : `{services_info['openrouter_model']}`\n",
+            f"Model : `{services_info['openrouter_model']}`\n"
+            f"Link Cache : {link_cache['hits']} hits / {link_cache['misses']} misses "
+            f"({link_cache['hit_rate']:.1f}%)\n"
+            f"Link Rules : {link_rules['matched']} matched / "
+            f"{link_rules['llm_calls_saved']} LLM calls saved\n"
+            f"Link Batches : {link_batches['batches']} requests / "
+            f"{link_batches['llm_calls_saved']} LLM calls saved\n" + fetch_line,
         )
 
         uptime = info["uptime"]